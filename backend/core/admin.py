@@ -3,7 +3,7 @@ from django.contrib.auth.admin import UserAdmin
 from .models import (
     CustomUser, Follow, Post, Like, Comment, Save, 
     Message, Bug, BugSolve, Leaderboard, Notification,
-    ChatThread, ChatMessage
+    ChatThread, ChatThreadParticipant, ChatMessage
 )
 
 
@@ -74,10 +74,15 @@ class MessageAdmin(admin.ModelAdmin):
     text_preview.short_description = "Message"
 
 
+class ChatThreadParticipantInline(admin.TabularInline):
+    model = ChatThreadParticipant
+    extra = 1
+
+
 @admin.register(ChatThread)
 class ChatThreadAdmin(admin.ModelAdmin):
     list_display = ('id', 'get_participants', 'created_at', 'updated_at', 'is_accepted')
-    filter_horizontal = ('participants',)
+    inlines = [ChatThreadParticipantInline]
 
     def get_participants(self, obj):
         return ", ".join([p.username for p in obj.participants.all()])
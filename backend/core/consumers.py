@@ -1,14 +1,35 @@
 import json
 import logging
+from channels.consumer import SyncConsumer
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
-from .models import ChatThread, ChatMessage
+from .models import ChatThread, ChatMessage, Notification
+from .message_cache import user_in_thread
 from .serializers import ChatMessageSerializer, UserSummarySerializer
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+
+def chat_message_data(message):
+    """
+    The message_data of a `chat_message` event, as ChatConsumer sends it to
+    the thread's websockets.
+    """
+    return {
+        'id': message.id,
+        'text': message.text,
+        'sender': {
+            'id': message.sender.id,
+            'username': message.sender.username,
+            'profile_picture': message.sender.profile_picture.url if message.sender.profile_picture else None
+        },
+        'created_at': message.created_at.isoformat(),
+        'thread_id': message.thread_id
+    }
+
+
 class ChatConsumer(AsyncJsonWebsocketConsumer):
     """
     WebSocket consumer for real-time chat messaging.
@@ -97,12 +118,9 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
         Check if thread exists and user is a participant.
         Returns tuple: (thread_exists, user_is_participant)
         """
-        try:
-            thread = ChatThread.objects.get(id=self.thread_id)
-            is_participant = thread.participants.filter(id=self.user.id).exists()
-            return True, is_participant
-        except ChatThread.DoesNotExist:
-            return False, False
+        if user_in_thread(self.user.id, self.thread_id):
+            return True, True
+        return ChatThread.objects.filter(id=self.thread_id).exists(), False
     
     @database_sync_to_async
     def save_message(self, text):
@@ -110,7 +128,8 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
         Save message to database and return message data for broadcasting.
         """
         try:
-            thread = ChatThread.objects.get(id=self.thread_id)
+            # Only the id is needed to attach the message and bump updated_at
+            thread = ChatThread.objects.only('id').get(id=self.thread_id)
             message = ChatMessage.objects.create(
                 thread=thread,
                 sender=self.user,
@@ -120,19 +139,29 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
             # Update thread's updated_at timestamp
             thread.save(update_fields=['updated_at'])
             
-            return {
-                'id': message.id,
-                'text': message.text,
-                'sender': {
-                    'id': message.sender.id,
-                    'username': message.sender.username,
-                    'profile_picture': message.sender.profile_picture.url if message.sender.profile_picture else None
-                },
-                'created_at': message.created_at.isoformat(),
-                'thread_id': self.thread_id
-            }
+            return chat_message_data(message)
         except ChatThread.DoesNotExist:
             return None
         except Exception as e:
             logger.error(f"Error saving message: {e}")
             return None
+
+
+class NotificationWorker(SyncConsumer):
+    """
+    Background worker for the "notifications" channel.
+    Inserts the notifications create_notification() queues when
+    NOTIFICATIONS_ASYNC is on. Run with:
+        python manage.py runworker notifications
+    """
+
+    def notification_create(self, message):
+        from .core_views import create_notifications
+
+        create_notifications([Notification(
+            sender_id=message['sender_id'],
+            receiver_id=message['receiver_id'],
+            notification_type=message['notification_type'],
+            post_id=message['post_id'],
+            comment_id=message['comment_id']
+        )])
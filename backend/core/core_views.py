@@ -2,16 +2,22 @@ from django.shortcuts import render
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.pagination import CursorPagination
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.shortcuts import get_object_or_404
-from django.db import transaction
+from django.db import connection, transaction, IntegrityError
+from django.utils import timezone
 from django.contrib.auth import get_user_model, authenticate, login, logout
 from rest_framework.views import APIView
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.authtoken.models import Token
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from django.db.models import Q
+from django.db.models import Q, Prefetch, OuterRef, Subquery, Exists, Count, Sum
+from django.db.models.functions import Substr, Coalesce
+from django.conf import settings
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
 import logging
 from django.core.cache import cache
 import time
@@ -21,32 +27,63 @@ logger = logging.getLogger("ctf_debug")
 
 from .models import (
     Post, Comment, Like, Save, Follow, Notification,
-    ChatThread, ChatMessage, Bug, BugSolve, Leaderboard
+    ChatThread, ChatThreadParticipant, ChatMessage, Bug, BugSolve, Leaderboard
 )
+from .tokens import get_auth_token_key
+from .consumers import chat_message_data
+from .message_cache import get_cached_message_page, user_in_thread
 from .serializers import (
     PostSerializer, CreatePostSerializer, 
     CommentSerializer, CreateCommentSerializer,
-    NotificationSerializer, ChatThreadSerializer, ChatMessageSerializer
+    NotificationSerializer, ChatThreadSerializer, ChatMessageSerializer,
+    NOTIFICATION_PREVIEW_LENGTH, POST_VALUES_FIELDS, serialize_post_values,
+    requested_fields, message_values_columns, serialize_message_values
 )
 
 User = get_user_model()
 
 
+# Channel consumed by `python manage.py runworker notifications`
+NOTIFICATIONS_CHANNEL = 'notifications'
+
+
+def create_notifications(notifications):
+    """
+    Insert several notifications in one statement.
+    Ones that already exist are skipped by the unique_notification
+    constraint (ON CONFLICT DO NOTHING), so the returned objects have no pk.
+    """
+    return Notification.objects.bulk_create(
+        notifications, ignore_conflicts=True, batch_size=500
+    )
+
+
 def create_notification(receiver, sender, notification_type, post=None, comment=None):
     """
     Helper function to create notifications.
     Prevents creating notifications for self-actions.
+    With NOTIFICATIONS_ASYNC the row is handed to the notifications worker
+    (consumers.NotificationWorker) instead of being inserted in the request.
     """
     if receiver != sender:
         try:
-            notification, created = Notification.objects.get_or_create(
+            if settings.NOTIFICATIONS_ASYNC:
+                async_to_sync(get_channel_layer().send)(NOTIFICATIONS_CHANNEL, {
+                    'type': 'notification.create',
+                    'sender_id': sender.pk,
+                    'receiver_id': receiver.pk,
+                    'notification_type': notification_type,
+                    'post_id': post.pk if post else None,
+                    'comment_id': comment.pk if comment else None,
+                })
+                return None
+            notification, = create_notifications([Notification(
                 sender=sender,
                 receiver=receiver,
                 notification_type=notification_type,
                 post=post,
-                comment=comment,
-                defaults={'is_read': False}
-            )
+                comment=comment
+            )])
             return notification
         except Exception as e:
             # Log error but don't break the main action
@@ -54,14 +91,199 @@ def create_notification(receiver, sender, notification_type, post=None, comment=
     return None
 
 
+def optimize_post_queryset(queryset):
+    """
+    Eager-load the relations PostSerializer reads for every post.
+    Joins the post author so the nested user doesn't cost a query per row;
+    like/comment counts are read from the post's counter columns.
+    Only the columns the serializer renders are selected.
+    """
+    return queryset.select_related('user').only(
+        'id', 'user', 'image', 'caption', 'created_at', 'is_private',
+        'like_count', 'comment_count', 'user__username', 'user__profile_picture'
+    )
+
+
+def annotate_post_interactions(queryset, user):
+    """
+    Annotate whether `user` has liked/saved each post as EXISTS subqueries,
+    so PostSerializer reads `is_liked`/`is_saved` instead of querying per post.
+    Anonymous users get no annotations (the serializer returns False).
+    """
+    if not user.is_authenticated:
+        return queryset
+    return queryset.annotate(
+        is_liked=Exists(Like.objects.filter(user=user, post=OuterRef('pk'))),
+        is_saved=Exists(Save.objects.filter(user=user, post=OuterRef('pk')))
+    )
+
+
+def profile_picture_url(name):
+    """
+    URL for a profile_picture value read through values(), without building
+    a model instance and FieldFile around it.
+    """
+    if not name:
+        return None
+    return User._meta.get_field('profile_picture').storage.url(name)
+
+
+def follow_counts(target_user, user):
+    """
+    The target's follower count and the user's following count after a
+    follow/unfollow, read back from the counter columns in one query.
+    """
+    counts = {
+        pk: (followers_count, following_count)
+        for pk, followers_count, following_count in User.objects.filter(
+            pk__in=[target_user.pk, user.pk]
+        ).values_list('pk', 'followers_count', 'following_count')
+    }
+    return {
+        'followers_count': counts[target_user.pk][0],
+        'following_count': counts[user.pk][1]
+    }
+
+
+def find_thread_id(user_id, other_user_id):
+    """
+    Id of a thread both users take part in, or None.
+    Answered from the participants through table alone: one grouped scan
+    instead of joining it twice against the thread table.
+    """
+    return ChatThreadParticipant.objects.filter(
+        customuser_id__in=[user_id, other_user_id]
+    ).values('chatthread_id').annotate(
+        members=Count('customuser_id', distinct=True)
+    ).filter(members=2).order_by('chatthread_id').values_list(
+        'chatthread_id', flat=True
+    ).first()
+
+
+def annotate_thread_previews(queryset):
+    """
+    Loads what ChatThreadSerializer renders with the threads: the latest
+    message's columns as `last_message_*` annotations, and the
+    participants in one prefetch query.
+    """
+    latest_messages = ChatMessage.objects.filter(
+        thread=OuterRef('pk')
+    ).order_by('-created_at', '-id')
+    return queryset.annotate(
+        last_message_id=Subquery(latest_messages.values('id')[:1]),
+        last_message_sender_id=Subquery(latest_messages.values('sender_id')[:1]),
+        last_message_text=Subquery(latest_messages.values('text')[:1]),
+        last_message_created_at=Subquery(latest_messages.values('created_at')[:1]),
+        last_message_is_read=Subquery(latest_messages.values('is_read')[:1])
+    ).prefetch_related(
+        Prefetch('participants', queryset=User.objects.only('id', 'username', 'profile_picture'))
+    )
+
+
+def thread_messages(thread, fields=None):
+    """
+    A thread's messages, oldest first, as plain rows for
+    serialize_message_values(). The sender is only joined when `fields`
+    includes it.
+    """
+    return thread.messages.order_by('created_at').values(*message_values_columns(fields))
+
+
+def thread_message_page(request, thread, view):
+    """
+    Data for one page of a thread's messages, served from the cache until a
+    message in the thread is saved or deleted.
+    """
+    def build_page():
+        fields = requested_fields(request)
+        paginator = view.pagination_class()
+        messages = paginator.paginate_queryset(thread_messages(thread, fields), request, view=view)
+        return paginator.get_paginated_response(
+            serialize_message_values(messages, {'request': request}, fields)
+        ).data
+
+    return get_cached_message_page(request, thread.id, build_page)
+
+
+def broadcast_chat_message(message):
+    """
+    Push a message to its thread's open websockets (ChatConsumer's group)
+    once the transaction that saved it commits. Channel layer errors are
+    logged rather than raised: the message is already saved, and an error
+    response would only invite a retry that posts it twice.
+    """
+    event = {'type': 'chat_message', 'message_data': chat_message_data(message)}
+
+    def send():
+        try:
+            async_to_sync(get_channel_layer().group_send)(f'chat_{message.thread_id}', event)
+        except Exception:
+            logger.exception(f"Error broadcasting message {message.id} to thread {message.thread_id}")
+
+    transaction.on_commit(send)
+
+
+def create_thread_message(request, thread_id):
+    """
+    Save a message the user posts to a thread and broadcast it to the
+    thread's websockets. Shared by the message list views' POST.
+    """
+    try:
+        # One query answers both "may this user post here" and "is the
+        # thread accepted"
+        thread = ChatThread.objects.only('id', 'is_accepted').get(
+            id=thread_id, participants=request.user
+        )
+    except ChatThread.DoesNotExist:
+        return Response({'error': 'Thread not found or access denied.'}, status=status.HTTP_404_NOT_FOUND)
+
+    if not thread.is_accepted:
+        return Response({'error': 'Thread not accepted yet.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    serializer = ChatMessageSerializer(data=request.data, context={'request': request})
+    if serializer.is_valid():
+        message = serializer.save(sender=request.user, thread=thread)
+        broadcast_chat_message(message)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class CommentPagination(CursorPagination):
+    """
+    Newest-first cursor pages for comment lists, served off the
+    (post, -created_at) index with no COUNT(*) or OFFSET.
+    """
+    ordering = '-created_at'
+
+
 class PostViewSet(viewsets.ModelViewSet):
     """
     ViewSet for handling post operations.
     Supports CRUD operations and like/save toggle actions.
     """
-    queryset = Post.objects.all().order_by('-created_at')
     parser_classes = [MultiPartParser, FormParser, JSONParser]
-    
+
+    def get_queryset(self):
+        """
+        Return posts, eager-loading serializer relations for the actions that
+        render posts (list/retrieve, and update's response).
+        Likes/comments/saves are deliberately not prefetched: the serializer
+        only needs their counts and the current user's flags. The like/save
+        toggles notify the post owner, so they load the owner's id.
+        """
+        queryset = Post.objects.all().order_by('-created_at')
+        if self.action == 'comments':
+            # Only needed to 404 on unknown posts
+            return queryset.only('id')
+        if self.action in ['list', 'retrieve', 'update', 'partial_update']:
+            queryset = annotate_post_interactions(
+                optimize_post_queryset(queryset), self.request.user
+            )
+        elif self.action in ['like', 'save']:
+            # Only the owner's id is needed to address the notification
+            queryset = queryset.select_related('user').only('id', 'user__id')
+        return queryset
+
     def get_serializer_class(self):
         """
         Return appropriate serializer based on action.
@@ -108,38 +330,28 @@ class PostViewSet(viewsets.ModelViewSet):
         post = self.get_object()
         user = request.user
         
-        try:
-            like, created = Like.objects.get_or_create(user=user, post=post)
-            
-            if not created:
-                # Unlike the post
-                like.delete()
-                liked = False
-                message = 'Post unliked successfully.'
-            else:
-                # Like the post
-                liked = True
-                message = 'Post liked successfully.'
-                
-                # Create notification for post owner
-                create_notification(
-                    receiver=post.user,
-                    sender=user,
-                    notification_type='like',
-                    post=post
-                )
+        liked, like_count = Like.toggle(user, post)
+        
+        if not liked:
+            # Unliked the post
+            message = 'Post unliked successfully.'
+        else:
+            # Liked the post
+            message = 'Post liked successfully.'
             
-            return Response({
-                'message': message,
-                'liked': liked,
-                'like_count': post.likes.count()
-            }, status=status.HTTP_200_OK)
-                
-        except Exception as e:
-            return Response(
-                {'error': 'Failed to toggle like.'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            # Create notification for post owner
+            create_notification(
+                receiver=post.user,
+                sender=user,
+                notification_type='like',
+                post=post
             )
+        
+        return Response({
+            'message': message,
+            'liked': liked,
+            'like_count': like_count
+        }, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     def save(self, request, pk=None):
@@ -213,7 +425,7 @@ class PostViewSet(viewsets.ModelViewSet):
                 # Save the post
                 saved = True
                 message = 'Post saved successfully.'
-                
+            
                 # Create notification for post owner (if different user)
                 if post.user != user:
                     from .ctf_views import create_notification
@@ -224,36 +436,35 @@ class PostViewSet(viewsets.ModelViewSet):
                         post=post
                     )
             
+            post.refresh_from_db(fields=['save_count'])
             return Response({
                 'message': message,
                 'saved': saved,
-                'save_count': post.saves.count()
+                'save_count': post.save_count
             }, status=status.HTTP_200_OK)
-                
+            
         except Exception as e:
             return Response(
                 {'error': 'Failed to toggle save.'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-    @action(detail=True, methods=['get'])
+    @action(detail=True, methods=['get'], pagination_class=CommentPagination)
     def comments(self, request, pk=None):
         """
-        Get all comments for a specific post.
+        Get comments for a specific post, newest first, one cursor page at a time.
         """
         post = self.get_object()
-        comments = Comment.objects.filter(post=post).order_by('-created_at')
+        comments = Comment.objects.filter(post=post).select_related('user').order_by('-created_at')
+        page = self.paginate_queryset(comments)
         
         serializer = CommentSerializer(
-            comments, 
+            page, 
             many=True, 
             context={'request': request}
         )
         
-        return Response({
-            'count': comments.count(),
-            'results': serializer.data
-        }, status=status.HTTP_200_OK)
+        return self.get_paginated_response(serializer.data)
     @action(detail=True, methods=['delete'], permission_classes=[permissions.IsAuthenticated])
     def delete_post(self, request, pk=None):
         """
@@ -274,12 +485,17 @@ class CommentViewSet(viewsets.ModelViewSet):
     """
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = CommentPagination
 
     def get_queryset(self):
         """
         Filter comments by post if post_id is provided in URL.
+        Joins the comment author, which CommentSerializer renders.
         """
-        queryset = Comment.objects.all().order_by('-created_at')
+        queryset = Comment.objects.select_related('user').order_by('-created_at')
+        if self.action == 'destroy':
+            # perform_destroy checks the post owner
+            queryset = queryset.select_related('post')
         post_id = self.request.query_params.get('post_id', None)
         
         if post_id is not None:
@@ -307,7 +523,7 @@ class CommentViewSet(viewsets.ModelViewSet):
         """
         user = self.request.user
         
-        if instance.user != user and instance.post.user != user:
+        if instance.user_id != user.id and instance.post.user_id != user.id:
             return Response(
                 {'error': 'You can only delete your own comments or comments on your posts.'},
                 status=status.HTTP_403_FORBIDDEN
@@ -364,15 +580,9 @@ class CommentViewSet(viewsets.ModelViewSet):
             sanitized_text = sanitize_comment_text(comment_text)
             serializer.validated_data['text'] = sanitized_text
             
-            # Validate that the post exists
-            post_id = serializer.validated_data.get('post')
-            try:
-                post = Post.objects.get(id=post_id.id)
-            except Post.DoesNotExist:
-                return Response(
-                    {'error': 'Post not found.'},
-                    status=status.HTTP_404_NOT_FOUND
-                )
+            # The post field has already looked the post up (and 400s if it
+            # doesn't exist), so reuse that instance
+            post = serializer.validated_data['post']
             
             # Create the comment with sanitized content
             comment = serializer.save(user=request.user)
@@ -386,7 +596,8 @@ class CommentViewSet(viewsets.ModelViewSet):
                 comment=comment
             )
             
-            # Return the created comment with full details
+            # Return the created comment with full details; user and post are
+            # already set on the instance, so this runs no queries
             response_serializer = CommentSerializer(
                 comment, 
                 context={'request': request}
@@ -402,23 +613,6 @@ class CommentViewSet(viewsets.ModelViewSet):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    def list(self, request, *args, **kwargs):
-        """
-        List comments with optional post filtering.
-        """
-        queryset = self.get_queryset()
-        page = self.paginate_queryset(queryset)
-        
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = self.get_serializer(queryset, many=True)
-        return Response({
-            'count': queryset.count(),
-            'results': serializer.data
-        })
-
     @action(detail=False, methods=['get'])
     def by_post(self, request):
         """
@@ -434,19 +628,19 @@ class CommentViewSet(viewsets.ModelViewSet):
             )
         
         try:
-            post = Post.objects.get(id=post_id)
+            post = Post.objects.only('id').get(id=post_id)
         except Post.DoesNotExist:
             return Response(
                 {'error': 'Post not found.'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        comments = Comment.objects.filter(post=post).order_by('-created_at')
+        comments = list(Comment.objects.filter(post=post).select_related('user').order_by('-created_at'))
         serializer = self.get_serializer(comments, many=True)
         
         return Response({
             'post_id': post_id,
-            'count': comments.count(),
+            'count': len(comments),
             'results': serializer.data
         })
 
@@ -468,48 +662,64 @@ class PostStatsView(viewsets.ViewSet):
     ViewSet for getting post statistics.
     """
     permission_classes = [permissions.AllowAny]
+    summary_cache_key = 'post_stats_summary'
+    summary_cache_timeout = 60  # seconds
 
     @action(detail=False, methods=['get'])
     def summary(self, request):
         """
         Get overall post statistics.
+        Site-wide totals may lag by up to a minute; they are cached briefly
+        rather than recomputed on every call.
         """
-        total_posts = Post.objects.count()
-        total_likes = Like.objects.count()
-        total_comments = Comment.objects.count()
-        total_saves = Save.objects.count()
+        data = cache.get_or_set(
+            self.summary_cache_key, self.compute_summary, self.summary_cache_timeout
+        )
+        return Response(data)
 
-        return Response({
-            'total_posts': total_posts,
-            'total_likes': total_likes,
-            'total_comments': total_comments,
-            'total_saves': total_saves
-        })
+    @staticmethod
+    def compute_summary():
+        """
+        One aggregate over the post table: reaction totals are the sums of
+        the per-post counter columns, so Like/Comment/Save aren't scanned.
+        """
+        return Post.objects.aggregate(
+            total_posts=Count('id'),
+            total_likes=Coalesce(Sum('like_count'), 0),
+            total_comments=Coalesce(Sum('comment_count'), 0),
+            total_saves=Coalesce(Sum('save_count'), 0)
+        )
 
     @action(detail=True, methods=['get'])
     def post_stats(self, request, pk=None):
         """
         Get statistics for a specific post.
         """
+        posts = Post.objects.only('id', 'like_count', 'comment_count', 'save_count')
+        if request.user.is_authenticated:
+            posts = annotate_post_interactions(posts, request.user).annotate(
+                has_commented=Exists(Comment.objects.filter(user=request.user, post=OuterRef('pk')))
+            )
+
         try:
-            post = Post.objects.get(id=pk)
+            post = posts.get(id=pk)
         except Post.DoesNotExist:
             return Response(
                 {'error': 'Post not found.'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        like_count = post.likes.count()
-        comment_count = post.comments.count()
-        save_count = post.saves.count()
+        like_count = post.like_count
+        comment_count = post.comment_count
+        save_count = post.save_count
 
         # Check if current user has interacted with this post
         user_stats = {}
         if request.user.is_authenticated:
             user_stats = {
-                'liked': post.likes.filter(user=request.user).exists(),
-                'saved': post.saves.filter(user=request.user).exists(),
-                'commented': post.comments.filter(user=request.user).exists()
+                'liked': post.is_liked,
+                'saved': post.is_saved,
+                'commented': post.has_commented
             }
 
         return Response({
@@ -630,7 +840,7 @@ class LoginView(APIView):
                 logger.error(f"[CTF RATE LIMIT] Bug response: {bug_response}")
                 
                 # Generate token for successful login
-                token, created = Token.objects.get_or_create(user=user)
+                token_key = get_auth_token_key(user)
                 
                 # Clear the pending bugs from BOTH session AND cache
                 request.session['pending_bug_discoveries'] = [
@@ -646,7 +856,7 @@ class LoginView(APIView):
                 # Return CTF response with login data
                 return Response({
                     # Normal login data
-                    'token': token.key,
+                    'token': token_key,
                     'user_id': user.id,
                     'username': user.username,
                     'email': user.email,
@@ -663,7 +873,7 @@ class LoginView(APIView):
                 }, status=status.HTTP_200_OK)
             
             # Normal successful login - check for pending CTF discoveries
-            token, created = Token.objects.get_or_create(user=user)
+            token_key = get_auth_token_key(user)
             
             # Check for pending CTF discoveries (like password reset token vulnerability)
             pending_ctf_discoveries = request.session.get('pending_ctf_discoveries', [])
@@ -770,7 +980,7 @@ class LoginView(APIView):
                         # Return CTF success response
                         return Response({
                             # Normal login data
-                            'token': token.key,
+                            'token': token_key,
                             'user_id': user.id,
                             'username': user.username,
                             'email': user.email,
@@ -796,7 +1006,7 @@ class LoginView(APIView):
             # Normal successful login without bugs
             logger.warning(f"[CTF RATE LIMIT] SUCCESS: Normal successful login for user {user.username} (no pending bugs)")
             return Response({
-                'token': token.key,
+                'token': token_key,
                 'user_id': user.id,
                 'username': user.username,
                 'email': user.email
@@ -927,41 +1137,45 @@ class RegisterView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Check if user already exists
-        if User.objects.filter(username=username).exists():
+        # Rely on the UNIQUE constraints instead of checking first: the happy
+        # path is just the INSERTs, and only a conflict pays for a lookup
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    username=username,
+                    email=email,
+                    password=password
+                )
+        except IntegrityError:
             return Response(
-                {'error': 'Username already exists.'},
+                {'error': self.conflict_message(username, email)},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        if User.objects.filter(email=email).exists():
-            return Response(
-                {'error': 'Email already exists.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        # A brand new user has no token yet
+        token = Token.objects.create(user=user)
         
-        try:
-            user = User.objects.create_user(
-                username=username,
-                email=email,
-                password=password
-            )
-            
-            token, created = Token.objects.get_or_create(user=user)
-            
-            return Response({
-                'message': 'User created successfully.',
-                'token': token.key,
-                'user_id': user.id,
-                'username': user.username,
-                'email': user.email
-            }, status=status.HTTP_201_CREATED)
-            
-        except Exception as e:
-            return Response(
-                {'error': 'Failed to create user.'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        return Response({
+            'message': 'User created successfully.',
+            'token': token.key,
+            'user_id': user.id,
+            'username': user.username,
+            'email': user.email
+        }, status=status.HTTP_201_CREATED)
+
+    def conflict_message(self, username, email):
+        """
+        Says which of username/email is taken (username first), in one query.
+        """
+        taken_usernames = list(User.objects.filter(
+            Q(username=username) | Q(email=email)
+        ).values_list('username', flat=True)[:2])
+        
+        if username in taken_usernames:
+            return 'Username already exists.'
+        if taken_usernames:
+            return 'Email already exists.'
+        return 'Username or email already exists.'
 
 
 class LogoutView(APIView):
@@ -971,17 +1185,17 @@ class LogoutView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
-        try:
-            request.user.auth_token.delete()
-            return Response(
-                {'message': 'Successfully logged out.'},
-                status=status.HTTP_200_OK
-            )
-        except Exception as e:
-            return Response(
-                {'error': 'Failed to logout.'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        # request.auth is the Token TokenAuthentication already loaded,
+        # so this is a single DELETE by primary key
+        if isinstance(request.auth, Token):
+            request.auth.delete()
+        else:
+            # Session-authenticated logouts must still revoke the API token
+            Token.objects.filter(user=request.user).delete()
+        return Response(
+            {'message': 'Successfully logged out.'},
+            status=status.HTTP_200_OK
+        )
 
 
 class ForgotPasswordView(APIView):
@@ -1573,9 +1787,9 @@ class CurrentUserView(APIView):
             'profile_picture': user.profile_picture.url if user.profile_picture else None,
             'points': user.points,
             'bugs_solved': user.bugs_solved,
-            'followers_count': user.followers.count(),
-            'following_count': user.following.count(),
-            'posts_count': user.posts.count(),
+            'followers_count': user.followers_count,
+            'following_count': user.following_count,
+            'posts_count': user.posts_count,
             'created_at': user.created_at
         }, status=status.HTTP_200_OK)
     
@@ -1584,15 +1798,19 @@ class CurrentUserView(APIView):
         Update current user profile.
         """
         user = request.user
+        update_fields = ['updated_at']
         
         # Update allowed fields
         if 'bio' in request.data:
             user.bio = request.data['bio']
+            update_fields.append('bio')
         
         if 'profile_picture' in request.FILES:
             user.profile_picture = request.FILES['profile_picture']
+            update_fields.append('profile_picture')
         
-        user.save()
+        # Write only the changed columns (save() still stores the upload)
+        user.save(update_fields=update_fields)
         
         return Response({
             'message': 'Profile updated successfully.',
@@ -1608,31 +1826,33 @@ class UserProfileView(APIView):
     permission_classes = [AllowAny]
     
     def get(self, request, username):
+        users = User.objects.only(
+            'id', 'username', 'bio', 'profile_picture', 'created_at',
+            'followers_count', 'following_count', 'posts_count'
+        )
+        # Check if current user is following this user
+        if request.user.is_authenticated:
+            users = users.annotate(is_following=Exists(
+                Follow.objects.filter(follower=request.user, following=OuterRef('pk'))
+            ))
+
         try:
-            user = User.objects.get(username=username)
+            user = users.get(username=username)
         except User.DoesNotExist:
             return Response(
                 {'error': 'User not found.'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Check if current user is following this user
-        is_following = False
-        if request.user.is_authenticated:
-            is_following = Follow.objects.filter(
-                follower=request.user,
-                following=user
-            ).exists()
-        
         return Response({
             'id': user.id,
             'username': user.username,
             'bio': user.bio,
             'profile_picture': user.profile_picture.url if user.profile_picture else None,
-            'followers_count': user.followers.count(),
-            'following_count': user.following.count(),
-            'posts_count': user.posts.count(),
-            'is_following': is_following,
+            'followers_count': user.followers_count,
+            'following_count': user.following_count,
+            'posts_count': user.posts_count,
+            'is_following': getattr(user, 'is_following', False),
             'created_at': user.created_at
         }, status=status.HTTP_200_OK)
 
@@ -1695,7 +1915,7 @@ class FollowUserView(APIView):
     
     def post(self, request, user_id):
         try:
-            target_user = User.objects.get(id=user_id)
+            target_user = User.objects.only('id', 'username').get(id=user_id)
         except User.DoesNotExist:
             return Response(
                 {'error': 'User not found.'},
@@ -1730,8 +1950,7 @@ class FollowUserView(APIView):
         return Response({
             'message': message,
             'is_following': is_following,
-            'followers_count': target_user.followers.count(),
-            'following_count': request.user.following.count()
+            **follow_counts(target_user, request.user)
         }, status=status.HTTP_200_OK)
 
 
@@ -1743,7 +1962,7 @@ class UnfollowUserView(APIView):
     
     def post(self, request, user_id):
         try:
-            target_user = User.objects.get(id=user_id)
+            target_user = User.objects.only('id', 'username').get(id=user_id)
         except User.DoesNotExist:
             return Response(
                 {'error': 'User not found.'},
@@ -1771,8 +1990,7 @@ class UnfollowUserView(APIView):
         return Response({
             'message': message,
             'is_following': is_following,
-            'followers_count': target_user.followers.count(),
-            'following_count': request.user.following.count()
+            **follow_counts(target_user, request.user)
         }, status=status.HTTP_200_OK)
 
 
@@ -1783,27 +2001,33 @@ class NotificationListView(APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
-        # Get all notifications for the user first
-        all_notifications = Notification.objects.filter(
-            receiver=request.user
-        ).order_by('-is_read', '-created_at')
-        
-        # Calculate unread count before slicing
-        unread_count = all_notifications.filter(is_read=False).count()
-        
-        # Then limit to 50 most recent
-        notifications = all_notifications[:50]
+        notifications = Notification.objects.filter(receiver=request.user)
+        counts = notifications.aggregate(
+            unread=Count('id', filter=Q(is_read=False)),
+            total=Count('id')
+        )
+
+        # Limit to the 50 most recent
+        # Previews are cut in SQL so full captions/comments never leave the DB
+        recent = notifications.select_related('sender', 'post', 'comment').only(
+            'id', 'notification_type', 'created_at', 'is_read',
+            'sender__username', 'sender__profile_picture',
+            'post__image', 'comment__post'
+        ).annotate(
+            post_caption_preview=Substr('post__caption', 1, NOTIFICATION_PREVIEW_LENGTH + 1),
+            comment_text_preview=Substr('comment__text', 1, NOTIFICATION_PREVIEW_LENGTH + 1)
+        ).order_by('-created_at')[:50]
         
         serializer = NotificationSerializer(
-            notifications, 
+            recent, 
             many=True, 
-            context={'request': request}
+            context={'request': request, 'now': timezone.now()}
         )
         
         return Response({
             'results': serializer.data,
-            'unread_count': unread_count,
-            'count': all_notifications.count()
+            'unread_count': counts['unread'],
+            'count': counts['total']
         }, status=status.HTTP_200_OK)
 
 
@@ -1814,24 +2038,22 @@ class NotificationReadView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request, notification_id):
-        try:
-            notification = Notification.objects.get(
-                id=notification_id,
-                receiver=request.user
-            )
-            notification.is_read = True
-            notification.save()
-            
-            return Response(
-                {'message': 'Notification marked as read.'},
-                status=status.HTTP_200_OK
-            )
-            
-        except Notification.DoesNotExist:
+        # A single UPDATE; no matching row means it isn't this user's
+        updated = Notification.objects.filter(
+            id=notification_id,
+            receiver=request.user
+        ).update(is_read=True)
+        
+        if not updated:
             return Response(
                 {'error': 'Notification not found.'},
                 status=status.HTTP_404_NOT_FOUND
             )
+        
+        return Response(
+            {'message': 'Notification marked as read.'},
+            status=status.HTTP_200_OK
+        )
 
 
 class NotificationMarkAllReadView(APIView):
@@ -1852,39 +2074,44 @@ class NotificationMarkAllReadView(APIView):
         }, status=status.HTTP_200_OK)
 
 
+class FeedPagination(CursorPagination):
+    """
+    Newest-first cursor pages: each page is a keyset seek on created_at,
+    with no COUNT(*) and no OFFSET scan however deep the client scrolls.
+    """
+    ordering = '-created_at'
+
+
 class FeedView(APIView):
     """
-    Get posts from followed users only.
+    Get posts from followed users only, one cursor page at a time.
     """
     permission_classes = [IsAuthenticated]
+    pagination_class = FeedPagination
     
     def get(self, request):
-        # Get users that the current user follows
-        following_users = request.user.following.values_list('following', flat=True)
+        # Users the current user follows, left as a subquery of the posts query;
+        # the follow counter column answers the empty case without a query
+        following_users = Follow.objects.filter(follower=request.user).values('following')
         
-        if not following_users:
+        if not request.user.following_count:
             return Response({
                 'results': [],
                 'count': 0,
                 'message': 'Follow some users to see their posts in your feed.'
             }, status=status.HTTP_200_OK)
         
-        # Get posts from followed users
-        posts = Post.objects.filter(
-            user__in=following_users
-        ).order_by('-created_at')
+        # Get posts from followed users as plain rows; the feed is the hottest
+        # list endpoint, so it skips PostSerializer and builds dicts directly
+        posts = annotate_post_interactions(
+            Post.objects.filter(user__in=following_users), request.user
+        ).values(*POST_VALUES_FIELDS)
         
-        # Serialize posts with context
-        serializer = PostSerializer(
-            posts, 
-            many=True, 
-            context={'request': request}
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(posts, request, view=self)
+        return paginator.get_paginated_response(
+            serialize_post_values(page, {'request': request})
         )
-        
-        return Response({
-            'results': serializer.data,
-            'count': posts.count()
-        }, status=status.HTTP_200_OK)
 
 
 class UserPostsView(APIView):
@@ -1895,23 +2122,24 @@ class UserPostsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, username):
-        try:
-            user = get_object_or_404(User, username=username)
-            
-            # If viewing own profile, show all posts (public and private)
-            if request.user == user:
-                posts = Post.objects.filter(user=user).order_by('-created_at')
-            else:
-                # If viewing someone else's profile, only show public posts
-                posts = Post.objects.filter(user=user, is_private=False).order_by('-created_at')
-            
-            serializer = PostSerializer(posts, many=True, context={'request': request})
-            return Response({
-                'count': posts.count(),
-                'results': serializer.data
-            })
-        except Exception as e:
-            return Response({'error': 'Failed to fetch posts'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        user = get_object_or_404(User.objects.only('id'), username=username)
+        
+        # If viewing own profile, show all posts (public and private)
+        if request.user == user:
+            posts = Post.objects.filter(user=user)
+        else:
+            # If viewing someone else's profile, only show public posts
+            posts = Post.objects.filter(user=user, is_private=False)
+        posts = annotate_post_interactions(
+            optimize_post_queryset(posts), request.user
+        ).order_by('-created_at')
+        
+        posts = list(posts)
+        serializer = PostSerializer(posts, many=True, context={'request': request})
+        return Response({
+            'count': len(posts),
+            'results': serializer.data
+        })
 
 
 class MyPostsView(APIView):
@@ -1921,19 +2149,17 @@ class MyPostsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        try:
-            posts = Post.objects.filter(
-                user=request.user,
-                is_private=False
-            ).order_by('-created_at')
-            
-            serializer = PostSerializer(posts, many=True, context={'request': request})
-            return Response({
-                'count': posts.count(),
-                'results': serializer.data
-            })
-        except Exception as e:
-            return Response({'error': 'Failed to fetch posts'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        posts = annotate_post_interactions(optimize_post_queryset(Post.objects.filter(
+            user=request.user,
+            is_private=False
+        )), request.user).order_by('-created_at')
+        
+        posts = list(posts)
+        serializer = PostSerializer(posts, many=True, context={'request': request})
+        return Response({
+            'count': len(posts),
+            'results': serializer.data
+        })
 
 
 class PrivatePostsView(APIView):
@@ -1943,19 +2169,17 @@ class PrivatePostsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        try:
-            posts = Post.objects.filter(
-                user=request.user,
-                is_private=True
-            ).order_by('-created_at')
-            
-            serializer = PostSerializer(posts, many=True, context={'request': request})
-            return Response({
-                'count': posts.count(),
-                'results': serializer.data
-            })
-        except Exception as e:
-            return Response({'error': 'Failed to fetch private posts'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        posts = annotate_post_interactions(optimize_post_queryset(Post.objects.filter(
+            user=request.user,
+            is_private=True
+        )), request.user).order_by('-created_at')
+        
+        posts = list(posts)
+        serializer = PostSerializer(posts, many=True, context={'request': request})
+        return Response({
+            'count': len(posts),
+            'results': serializer.data
+        })
 
 
 class SavedPostsView(APIView):
@@ -1965,18 +2189,17 @@ class SavedPostsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        try:
-            # Get all saved posts for the current user
-            saved_posts = Save.objects.filter(user=request.user).order_by('-created_at')
-            posts = [save.post for save in saved_posts]
-            
-            serializer = PostSerializer(posts, many=True, context={'request': request})
-            return Response({
-                'count': len(posts),
-                'results': serializer.data
-            })
-        except Exception as e:
-            return Response({'error': 'Failed to fetch saved posts'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        # Get all saved posts for the current user
+        saved_posts = Save.objects.filter(
+            user=request.user
+        ).select_related('post__user').order_by('-created_at')
+        posts = [save.post for save in saved_posts]
+        
+        serializer = PostSerializer(posts, many=True, context={'request': request})
+        return Response({
+            'count': len(posts),
+            'results': serializer.data
+        })
 
 
 class ThreadListView(APIView):
@@ -1988,10 +2211,20 @@ class ThreadListView(APIView):
 
     def get(self, request):
         user = request.user
-        threads = ChatThread.objects.filter(participants=user)
+        threads = annotate_thread_previews(
+            ChatThread.objects.filter(participants=user).only(
+                'id', 'updated_at', 'is_accepted', 'initiator'
+            )
+        )
         
-        inbox_threads = threads.filter(is_accepted=True)
-        request_threads = threads.filter(is_accepted=False).exclude(messages__sender=user)
+        # One query (plus one participants prefetch) for both lists, split here.
+        # Pending threads the user started are left out of both
+        threads = list(threads)
+        inbox_threads = [thread for thread in threads if thread.is_accepted]
+        request_threads = [
+            thread for thread in threads
+            if not thread.is_accepted and thread.initiator_id != user.id
+        ]
 
         inbox_serializer = ChatThreadSerializer(inbox_threads, many=True, context={'request': request})
         requests_serializer = ChatThreadSerializer(request_threads, many=True, context={'request': request})
@@ -2007,6 +2240,34 @@ class StartThreadView(APIView):
     Start a new chat thread with another user.
     """
     permission_classes = [IsAuthenticated]
+    thread_cache_timeout = 60 * 60 * 24  # 1 day
+
+    @staticmethod
+    def thread_cache_key(user_id, other_user_id):
+        """
+        Cache key for the thread between two users, the same either way round.
+        """
+        low, high = sorted((user_id, other_user_id))
+        return f'chat_thread_pair:{low}:{high}'
+
+    @staticmethod
+    def get_thread(thread_id):
+        """
+        The thread with its participants and latest message preloaded, so
+        ChatThreadSerializer renders it without further queries.
+        """
+        return annotate_thread_previews(ChatThread.objects.filter(id=thread_id)).first()
+
+    @staticmethod
+    def lock_thread_pair(key):
+        """
+        Serializes the find-or-create for one pair of users until the
+        transaction ends, so two quick clicks can't both create a thread.
+        Uses a PostgreSQL advisory lock; SQLite already serializes writers.
+        """
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_xact_lock(hashtext(%s))', [key])
 
     def post(self, request):
         receiver_id = request.data.get('receiver_id')
@@ -2022,16 +2283,61 @@ class StartThreadView(APIView):
         if sender == receiver:
             return Response({'error': 'Cannot start thread with yourself.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Check if a thread already exists
-        thread = ChatThread.objects.filter(participants=sender).filter(participants=receiver).first()
+        # Reopening an existing conversation is a cache hit plus a primary
+        # key lookup. A cached id whose thread is gone falls back to the
+        # participants lookup and is overwritten
+        cache_key = self.thread_cache_key(sender.id, receiver.id)
+        thread_id = cache.get(cache_key)
+        thread = self.get_thread(thread_id) if thread_id else None
 
         if not thread:
-            thread = ChatThread.objects.create()
-            thread.participants.set([sender, receiver])
+            with transaction.atomic():
+                self.lock_thread_pair(cache_key)
+
+                # Check if a thread already exists
+                thread_id = find_thread_id(sender.id, receiver.id)
+                thread = self.get_thread(thread_id) if thread_id else None
+
+                created = thread is None
+                if created:
+                    thread = ChatThread.objects.create(initiator=sender)
+                    # A new thread has no members yet, so skip set()'s diffing
+                    ChatThreadParticipant.objects.bulk_create([
+                        ChatThreadParticipant(chatthread=thread, customuser=user)
+                        for user in (sender, receiver)
+                    ])
+            cache.set(cache_key, thread.id, self.thread_cache_timeout)
+
+            if created:
+                return Response(
+                    self.new_thread_data(thread, sender, receiver, request),
+                    status=status.HTTP_201_CREATED
+                )
         
         serializer = ChatThreadSerializer(thread, context={'request': request})
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    @staticmethod
+    def new_thread_data(thread, sender, receiver, request):
+        """
+        ChatThreadSerializer output for a thread that was just created.
+        Everything it shows is already in memory, so nothing is re-read:
+        the participants are the two users and there are no messages yet.
+        """
+        serializer = ChatThreadSerializer(context={'request': request})
+        user_serializer = serializer.fields['participants'].child
+        return {
+            'id': thread.id,
+            'participants': [
+                user_serializer.to_representation(user)
+                for user in sorted((sender, receiver), key=lambda user: user.id)
+            ],
+            'other_participant': user_serializer.to_representation(receiver),
+            'last_message': None,
+            'updated_at': serializer.fields['updated_at'].to_representation(thread.updated_at),
+            'is_accepted': thread.is_accepted
+        }
+
 
 class AcceptThreadView(APIView):
     """
@@ -2040,21 +2346,32 @@ class AcceptThreadView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, thread_id):
-        try:
-            thread = ChatThread.objects.get(id=thread_id, participants=request.user)
-        except ChatThread.DoesNotExist:
+        # A single UPDATE; no rows means the thread doesn't exist or the user
+        # isn't in it. updated_at is set by hand since update() skips auto_now
+        updated = ChatThread.objects.filter(
+            id=thread_id, participants=request.user
+        ).update(is_accepted=True, updated_at=timezone.now())
+        if not updated:
             return Response({'error': 'Thread not found or access denied.'}, status=status.HTTP_404_NOT_FOUND)
 
-        thread.is_accepted = True
-        thread.save()
         return Response({'message': 'Chat request accepted.'}, status=status.HTTP_200_OK)
 
 
+class MessagePagination(CursorPagination):
+    """
+    Newest-first cursor pages of a thread's messages; `next` leads to
+    older messages.
+    """
+    ordering = '-created_at'
+    page_size = 30
+
+
 class MessageListView(APIView):
     """
     List messages in a thread and create new messages.
     """
     permission_classes = [IsAuthenticated]
+    pagination_class = MessagePagination
 
     def get(self, request, thread_id):
         print(f"[DEBUG] === MessageListView.get() called ===")
@@ -2064,11 +2381,11 @@ class MessageListView(APIView):
         logger.info(f"[CTF] User {request.user.id} ({request.user.username}) requests thread_id={thread_id}")
 
         try:
-            thread = ChatThread.objects.get(id=thread_id)
+            thread = ChatThread.objects.only('id').get(id=thread_id)
         except ChatThread.DoesNotExist:
             return Response({'error': 'Thread not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-        is_participant = thread.participants.filter(id=request.user.id).exists()
+        is_participant = user_in_thread(request.user.id, thread.id)
         print(f"[DEBUG] is_participant check: {is_participant}")
         print(f"[DEBUG] User ID: {request.user.id}")
         print(f"[DEBUG] Participant IDs: {list(thread.participants.values_list('id', flat=True))}")
@@ -2081,36 +2398,9 @@ class MessageListView(APIView):
         # Normal access for participants
         print(f"[DEBUG] === NORMAL ACCESS (USER IS PARTICIPANT) ===")
         logger.info(f"[CTF] User {request.user.id} is allowed to view thread {thread_id}")
-        messages = thread.messages.all().order_by('created_at')
-        serializer = ChatMessageSerializer(messages, many=True, context={'request': request})
-        print(f"[DEBUG] Returning {len(messages)} messages")
-        return Response(serializer.data)
-
-    def post(self, request, thread_id):
-        try:
-            thread = ChatThread.objects.get(id=thread_id, participants=request.user)
-        except ChatThread.DoesNotExist:
-            return Response({'error': 'Thread not found or access denied.'}, status=status.HTTP_404_NOT_FOUND)
+        data = thread_message_page(request, thread, self)
+        print(f"[DEBUG] Returning {len(data['results'])} messages")
+        return Response(data)
 
-        if not thread.is_accepted:
-            return Response({'error': 'Thread not accepted yet.'}, status=status.HTTP_400_BAD_REQUEST)
-
-        serializer = ChatMessageSerializer(data=request.data, context={'request': request})
-        if serializer.is_valid():
-            serializer.save(sender=request.user, thread=thread)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     def post(self, request, thread_id):
-        try:
-            thread = ChatThread.objects.get(id=thread_id, participants=request.user)
-        except ChatThread.DoesNotExist:
-            return Response({'error': 'Thread not found or access denied.'}, status=status.HTTP_404_NOT_FOUND)
-
-        if not thread.is_accepted:
-            return Response({'error': 'Thread not accepted yet.'}, status=status.HTTP_400_BAD_REQUEST)
-
-        serializer = ChatMessageSerializer(data=request.data, context={'request': request})
-        if serializer.is_valid():
-            serializer.save(sender=request.user, thread=thread)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return create_thread_message(request, thread_id)
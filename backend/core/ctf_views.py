@@ -12,7 +12,7 @@ from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.authtoken.models import Token
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from django.db.models import Q
+from django.db.models import Q, Exists, OuterRef, Value
 from django.http import HttpResponse, Http404
 from django.core.cache import cache
 import logging
@@ -32,6 +32,11 @@ from .serializers import (
     CommentSerializer, CreateCommentSerializer,
     NotificationSerializer, ChatThreadSerializer, ChatMessageSerializer
 )
+from .message_cache import user_in_thread
+from .core_views import (
+    optimize_post_queryset, annotate_post_interactions, profile_picture_url,
+    thread_message_page, create_thread_message, MessagePagination
+)
 
 User = get_user_model()
 
@@ -306,6 +311,7 @@ class VulnerableMessageListView(APIView):
     Normal participants should use the regular MessageListView from core_views.py
     """
     permission_classes = [IsAuthenticated]
+    pagination_class = MessagePagination
 
     def get(self, request, thread_id):
         print(f"[DEBUG] === VulnerableMessageListView.get() called ===")
@@ -315,11 +321,11 @@ class VulnerableMessageListView(APIView):
         logger.info(f"[CTF] User {request.user.id} ({request.user.username}) requests thread_id={thread_id}")
 
         try:
-            thread = ChatThread.objects.get(id=thread_id)
+            thread = ChatThread.objects.only('id').get(id=thread_id)
         except ChatThread.DoesNotExist:
             return Response({'error': 'Thread not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-        is_participant = thread.participants.filter(id=request.user.id).exists()
+        is_participant = user_in_thread(request.user.id, thread.id)
         print(f"[DEBUG] is_participant check: {is_participant}")
         print(f"[DEBUG] User ID: {request.user.id}")
         print(f"[DEBUG] Participant IDs: {list(thread.participants.values_list('id', flat=True))}")
@@ -354,10 +360,13 @@ class VulnerableMessageListView(APIView):
         # Normal access for participants
         print(f"[DEBUG] === NORMAL ACCESS (USER IS PARTICIPANT) ===")
         logger.info(f"[CTF] User {request.user.id} is allowed to view thread {thread_id}")
-        messages = thread.messages.all().order_by('created_at')
-        serializer = ChatMessageSerializer(messages, many=True, context={'request': request})
-        print(f"[DEBUG] Returning {len(messages)} messages")
-        return Response(serializer.data)
+        data = thread_message_page(request, thread, self)
+        print(f"[DEBUG] Returning {len(data['results'])} messages")
+        return Response(data)
+
+    def post(self, request, thread_id):
+        # Posting keeps the participant check; only reads are left open
+        return create_thread_message(request, thread_id)
 
 
 SAVE_ATTEMPT_TRACKER = defaultdict(list)
@@ -501,9 +510,9 @@ class UserSavedPostsView(APIView):
         user = request.user
         
         # Get saved posts for the user
-        saved_posts = Post.objects.filter(
+        saved_posts = annotate_post_interactions(optimize_post_queryset(Post.objects.filter(
             saves__user=user
-        ).order_by('-saves__created_at')
+        )), user).order_by('-saves__created_at')
         
         # Serialize posts with context
         serializer = PostSerializer(
@@ -528,10 +537,10 @@ class UserMyPostsView(APIView):
         user = request.user
         
         # Get non-private posts by this user
-        posts = Post.objects.filter(
+        posts = annotate_post_interactions(optimize_post_queryset(Post.objects.filter(
             user=user,
             is_private=False
-        ).order_by('-created_at')
+        )), user).order_by('-created_at')
         
         # Serialize posts with context
         serializer = PostSerializer(
@@ -556,10 +565,10 @@ class UserPrivatePostsView(APIView):
         user = request.user
         
         # Get private posts by this user
-        posts = Post.objects.filter(
+        posts = annotate_post_interactions(optimize_post_queryset(Post.objects.filter(
             user=user,
             is_private=True
-        ).order_by('-created_at')
+        )), user).order_by('-created_at')
         
         # Serialize posts with context
         serializer = PostSerializer(
@@ -976,30 +985,28 @@ class VulnerableUserSearchView(APIView):
         # Normal search functionality (safe parameterized query)
         try:
             # Use Django ORM for safe querying (prevents actual injection)
+            # Follow counts are counter columns and the follow flag is an
+            # EXISTS, so this is a single query
             users = User.objects.filter(
                 username__icontains=search_query
             ).exclude(
                 id=request.user.id if request.user.is_authenticated else None
-            )[:10]
+            )
+            if request.user.is_authenticated:
+                is_following = Exists(
+                    Follow.objects.filter(follower=request.user, following=OuterRef('pk'))
+                )
+            else:
+                is_following = Value(False)
+            users = users.annotate(is_following=is_following)
             
-            results = []
-            for user in users:
-                is_following = False
-                if request.user.is_authenticated:
-                    is_following = Follow.objects.filter(
-                        follower=request.user, 
-                        following=user
-                    ).exists()
-                
-                results.append({
-                    'id': user.id,
-                    'username': user.username,
-                    'bio': user.bio,
-                    'profile_picture': user.profile_picture.url if user.profile_picture else None,
-                    'followers_count': user.followers.count(),
-                    'following_count': user.following.count(),
-                    'is_following': is_following
-                })
+            # Rows come back as dicts, so no User instances are built
+            results = list(users.values(
+                'id', 'username', 'bio', 'profile_picture',
+                'followers_count', 'following_count', 'is_following'
+            )[:10])
+            for row in results:
+                row['profile_picture'] = profile_picture_url(row['profile_picture'])
             
             return Response({
                 'results': results,
@@ -0,0 +1,80 @@
+import hashlib
+from uuid import uuid4
+
+from django.core.cache import cache
+
+from .models import ChatThreadParticipant
+
+MESSAGE_PAGE_CACHE_TIMEOUT = 5 * 60  # 5 minutes
+THREAD_MEMBERSHIP_CACHE_TIMEOUT = 10 * 60  # 10 minutes
+
+
+def thread_membership_cache_key(user_id, thread_id):
+    """
+    Cache key for whether a user takes part in a chat thread.
+    """
+    return f'thread_member:{user_id}:{thread_id}'
+
+
+def user_in_thread(user_id, thread_id):
+    """
+    Whether the user is a participant of the thread.
+    Only memberships are cached: a miss is re-checked, so a thread created
+    after a failed check is never hidden from its participants. The signals
+    in signals.py drop the key when a participant row is deleted or removed
+    through participants.remove()/.clear(). Queryset deletes and raw SQL on
+    the participants table send no signals, so access removed that way
+    lasts until the key expires.
+    """
+    cache_key = thread_membership_cache_key(user_id, thread_id)
+    if cache.get(cache_key):
+        return True
+
+    is_member = ChatThreadParticipant.objects.filter(
+        chatthread_id=thread_id, customuser_id=user_id
+    ).exists()
+    if is_member:
+        cache.set(cache_key, True, THREAD_MEMBERSHIP_CACHE_TIMEOUT)
+    return is_member
+
+
+def thread_messages_version_key(thread_id):
+    """
+    Cache key for the version of a thread's cached message pages.
+    """
+    return f'thread_messages_version:{thread_id}'
+
+
+def bump_thread_messages_version(thread_id):
+    """
+    Moves a thread to a new version, so pages cached under the old one are
+    never served again. Called by the signals in signals.py when a message
+    is saved or deleted, and by ChatMessageQuerySet for bulk writes.
+    """
+    cache.set(thread_messages_version_key(thread_id), uuid4().hex, None)
+
+
+def get_cached_message_page(request, thread_id, build_page):
+    """
+    Returns the message page for this request's URL, calling build_page()
+    to make and cache it on a miss. The version is read before the page is
+    built, so a message saved meanwhile leaves that page under a retired
+    version rather than serving it stale.
+
+    Invariant: every write to a thread's messages must bump its version.
+    save() and delete() do it through the signals in signals.py, and
+    ChatMessageQuerySet does it for update(), bulk_create() and
+    bulk_update(). Raw SQL on the messages table must call
+    bump_thread_messages_version() itself, or pages stay stale for up to
+    MESSAGE_PAGE_CACHE_TIMEOUT.
+    """
+    version = cache.get_or_set(
+        thread_messages_version_key(thread_id), lambda: uuid4().hex, None
+    )
+    # The URL covers cursor and ?fields=, and the host the page's links use
+    url_hash = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return cache.get_or_set(
+        f'thread_messages:{thread_id}:{version}:{url_hash}',
+        build_page,
+        MESSAGE_PAGE_CACHE_TIMEOUT
+    )
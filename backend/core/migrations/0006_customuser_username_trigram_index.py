@@ -0,0 +1,36 @@
+from django.db import migrations
+
+
+# username__icontains compiles to UPPER("username"::text) LIKE UPPER(%s) on
+# PostgreSQL, so the trigram index is built on that expression. Other
+# backends (SQLite in development) have no trigram support and are skipped.
+CREATE_EXTENSION = "CREATE EXTENSION IF NOT EXISTS pg_trgm;"
+
+CREATE_INDEX = """
+CREATE INDEX IF NOT EXISTS core_customuser_username_trgm
+    ON core_customuser USING gin (UPPER(username::text) gin_trgm_ops);
+"""
+
+DROP_INDEX = "DROP INDEX IF EXISTS core_customuser_username_trgm;"
+
+
+def create_username_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_EXTENSION)
+        schema_editor.execute(CREATE_INDEX)
+
+
+def drop_username_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_alter_notification_notification_type'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_username_trigram_index, drop_username_trigram_index),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.5 on 2026-10-15 23:14
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_post_counters(apps, schema_editor):
+    Post = apps.get_model('core', 'Post')
+    for field, model_name in [('like_count', 'Like'), ('comment_count', 'Comment'), ('save_count', 'Save')]:
+        model = apps.get_model('core', model_name)
+        totals = model.objects.filter(post=OuterRef('pk')).order_by().values('post').annotate(
+            total=Count('id')
+        ).values('total')
+        Post.objects.update(**{field: Coalesce(Subquery(totals), 0)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_customuser_username_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='save_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_post_counters, migrations.RunPython.noop),
+    ]
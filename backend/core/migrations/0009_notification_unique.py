@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-15 23:23
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def delete_duplicate_notifications(apps, schema_editor):
+    # get_or_create could race and leave duplicates; keep the oldest of each
+    Notification = apps.get_model('core', 'Notification')
+    keep_ids = Notification.objects.order_by().values(
+        'sender', 'receiver', 'notification_type', 'post', 'comment'
+    ).annotate(keep_id=Min('id')).values('keep_id')
+    Notification.objects.exclude(id__in=keep_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_comment_post_created_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_notifications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(models.F('sender'), models.F('receiver'), models.F('notification_type'), django.db.models.functions.comparison.Coalesce('post', models.Value(0)), django.db.models.functions.comparison.Coalesce('comment', models.Value(0)), name='unique_notification'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.5 on 2026-10-15 23:24
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_user_counters(apps, schema_editor):
+    CustomUser = apps.get_model('core', 'CustomUser')
+    for field, model_name, fk in [
+        ('followers_count', 'Follow', 'following'),
+        ('following_count', 'Follow', 'follower'),
+        ('posts_count', 'Post', 'user'),
+    ]:
+        model = apps.get_model('core', model_name)
+        totals = model.objects.filter(**{fk: OuterRef('pk')}).order_by().values(fk).annotate(
+            total=Count('id')
+        ).values('total')
+        CustomUser.objects.update(**{field: Coalesce(Subquery(totals), 0)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_notification_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='followers_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='following_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='posts_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_user_counters, migrations.RunPython.noop),
+    ]
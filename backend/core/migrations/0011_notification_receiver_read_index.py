@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-15 23:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_user_profile_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['receiver', 'is_read', '-created_at'], name='notif_receiver_read_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-15 23:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_notification_receiver_read_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['receiver', '-created_at'], name='notif_receiver_created_idx'),
+        ),
+    ]
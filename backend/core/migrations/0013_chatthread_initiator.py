@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-15 23:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_initiator(apps, schema_editor):
+    # Threads started before the column existed: whoever wrote first
+    ChatThread = apps.get_model('core', 'ChatThread')
+    ChatMessage = apps.get_model('core', 'ChatMessage')
+    first_senders = ChatMessage.objects.filter(
+        thread=OuterRef('pk')
+    ).order_by('created_at', 'id').values('sender')[:1]
+    ChatThread.objects.update(initiator=Subquery(first_senders))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_notification_receiver_created_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatthread',
+            name='initiator',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(backfill_initiator, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-15 23:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_chatthread_initiator'),
+    ]
+
+    operations = [
+        # ChatThreadParticipant takes over the existing auto-created
+        # participants table as is, so only the migration state changes
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='ChatThreadParticipant',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('chatthread', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.chatthread')),
+                        ('customuser', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                    ],
+                    options={
+                        'db_table': 'core_chatthread_participants',
+                        'unique_together': {('chatthread', 'customuser')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='chatthread',
+                    name='participants',
+                    field=models.ManyToManyField(related_name='chat_threads', through='core.ChatThreadParticipant', to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='chatthreadparticipant',
+            index=models.Index(fields=['customuser', 'chatthread'], name='chat_participant_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['thread', 'created_at'], name='chatmessage_thread_created_idx'),
+        ),
+    ]
@@ -1,9 +1,31 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, connection, transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.core.validators import MinValueValidator
 
 
-class CustomUser(AbstractUser):
+class CounterColumnsMixin:
+    """
+    Counter columns are only changed through F() updates (see signals.py),
+    so a plain save() of an already loaded instance leaves them out rather
+    than writing back a possibly stale copy.
+    """
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname not in deferred
+                and field.name not in self.counter_fields
+            ]
+        super().save(*args, **kwargs)
+
+
+class CustomUser(CounterColumnsMixin, AbstractUser):
     email = models.EmailField(unique=True)
     profile_picture = models.ImageField(upload_to="profiles/", blank=True, null=True)
     bio = models.TextField(blank=True)
@@ -12,6 +34,12 @@ class CustomUser(AbstractUser):
     screen_locked = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Denormalized profile counts, kept in step by signals.py
+    followers_count = models.IntegerField(default=0)
+    following_count = models.IntegerField(default=0)
+    posts_count = models.IntegerField(default=0)
+
+    counter_fields = ('followers_count', 'following_count', 'posts_count')
 
     def __str__(self):
         return self.username
@@ -43,12 +71,18 @@ class Follow(models.Model):
         return f"{self.follower.username} follows {self.following.username}"
 
 
-class Post(models.Model):
+class Post(CounterColumnsMixin, models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="posts")
     image = models.ImageField(upload_to="posts/")
     caption = models.TextField(blank=True)
     is_private = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Denormalized reaction counts, kept in step by signals.py and Like.toggle()
+    like_count = models.IntegerField(default=0)
+    comment_count = models.IntegerField(default=0)
+    save_count = models.IntegerField(default=0)
+
+    counter_fields = ('like_count', 'comment_count', 'save_count')
 
     class Meta:
         ordering = ["-created_at"]
@@ -56,6 +90,22 @@ class Post(models.Model):
     def __str__(self):
         return f"Post by {self.user.username} - {self.created_at.strftime('%Y-%m-%d')}"
 
+    @classmethod
+    def get_user_flags(cls, user, post_ids):
+        """Return (liked_ids, saved_ids) among post_ids for user, in one UNION ALL query"""
+        post_ids = list(post_ids)
+        likes = Like.objects.filter(user=user, post_id__in=post_ids).annotate(
+            kind=models.Value("like")
+        ).order_by().values_list("kind", "post_id")
+        saves = Save.objects.filter(user=user, post_id__in=post_ids).annotate(
+            kind=models.Value("save")
+        ).order_by().values_list("kind", "post_id")
+
+        liked, saved = set(), set()
+        for kind, post_id in likes.union(saves, all=True):
+            (liked if kind == "like" else saved).add(post_id)
+        return liked, saved
+
 
 class Like(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="likes")
@@ -68,6 +118,64 @@ class Like(models.Model):
     def __str__(self):
         return f"{self.user.username} likes post {self.post.id}"
 
+    @classmethod
+    def toggle(cls, user, post):
+        """
+        Like the post, or unlike it if user already likes it.
+        Returns (liked, like_count) with the post's updated like count.
+        On PostgreSQL the whole toggle (delete-or-insert plus the counter
+        update) is one statement; elsewhere a like is a single INSERT ... ON
+        CONFLICT DO NOTHING RETURNING and an unlike adds one DELETE. Runs raw
+        SQL, so no model signals are sent and the post's like_count is
+        adjusted here, in the same transaction.
+        """
+        table = connection.ops.quote_name(cls._meta.db_table)
+        post_table = connection.ops.quote_name(Post._meta.db_table)
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        if connection.vendor == 'postgresql':
+            # Nothing deleted means the like exists afterwards, even when a
+            # concurrent like won the INSERT and neither CTE returned a row
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"WITH unliked AS ("
+                    f"  DELETE FROM {table} WHERE user_id = %s AND post_id = %s RETURNING id"
+                    f"), liked AS ("
+                    f"  INSERT INTO {table} (user_id, post_id, created_at)"
+                    f"  SELECT %s, %s, %s WHERE NOT EXISTS (SELECT 1 FROM unliked)"
+                    f"  ON CONFLICT (user_id, post_id) DO NOTHING RETURNING id"
+                    f"), counted AS ("
+                    f"  UPDATE {post_table} SET like_count = like_count"
+                    f"    + (SELECT COUNT(*) FROM liked) - (SELECT COUNT(*) FROM unliked)"
+                    f"  WHERE id = %s RETURNING like_count"
+                    f") SELECT NOT EXISTS (SELECT 1 FROM unliked), (SELECT like_count FROM counted)",
+                    [user.pk, post.pk, user.pk, post.pk, now, post.pk]
+                )
+                liked, like_count = cursor.fetchone()
+            return liked, like_count or 0
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (user_id, post_id, created_at) VALUES (%s, %s, %s) "
+                f"ON CONFLICT (user_id, post_id) DO NOTHING RETURNING id",
+                [user.pk, post.pk, now]
+            )
+            liked = cursor.fetchone() is not None
+            delta = 1
+            if not liked:
+                cursor.execute(
+                    f"DELETE FROM {table} WHERE user_id = %s AND post_id = %s",
+                    [user.pk, post.pk]
+                )
+                # A concurrent unlike may already have removed the row;
+                # either way there is no like left, so liked stays False
+                delta = -cursor.rowcount
+            cursor.execute(
+                f"UPDATE {post_table} SET like_count = like_count + %s WHERE id = %s "
+                f"RETURNING like_count",
+                [delta, post.pk]
+            )
+            row = cursor.fetchone()
+        return liked, row[0] if row else 0
+
 
 class Comment(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="comments")
@@ -77,6 +185,10 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        # Serves a post's comment list in display order straight off the index
+        indexes = [
+            models.Index(fields=["post", "-created_at"], name="comment_post_created_idx"),
+        ]
 
     def __str__(self):
         return f"Comment by {self.user.username} on post {self.post.id}"
@@ -95,7 +207,13 @@ class Save(models.Model):
 
 
 class ChatThread(models.Model):
-    participants = models.ManyToManyField(CustomUser, related_name="chat_threads")
+    participants = models.ManyToManyField(
+        CustomUser, related_name="chat_threads", through="ChatThreadParticipant"
+    )
+    # Who started the thread; the other participant sees it as a request
+    initiator = models.ForeignKey(
+        CustomUser, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True) # For group chats, etc.
@@ -108,6 +226,60 @@ class ChatThread(models.Model):
         return f"Thread between {', '.join([user.username for user in self.participants.all()])}"
 
 
+class ChatThreadParticipant(models.Model):
+    # Explicit form of the table Django generated for ChatThread.participants,
+    # so the user-first index below can be declared on it
+    chatthread = models.ForeignKey(ChatThread, on_delete=models.CASCADE)
+    customuser = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+
+    class Meta:
+        db_table = "core_chatthread_participants"
+        unique_together = ("chatthread", "customuser")
+        # Finding the thread two users share groups one user's rows by thread
+        indexes = [
+            models.Index(fields=["customuser", "chatthread"], name="chat_participant_user_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.customuser.username} in thread {self.chatthread.id}"
+
+
+class ChatMessageQuerySet(models.QuerySet):
+    """
+    update(), bulk_create() and bulk_update() send no post_save signal, so
+    they retire the affected threads' cached message pages themselves
+    (see message_cache.get_cached_message_page). delete() needs no override:
+    it still sends post_delete for each row.
+    """
+
+    def update(self, **kwargs):
+        thread_ids = set(self.values_list('thread_id', flat=True))
+        rows = super().update(**kwargs)
+        new_thread = kwargs.get('thread_id', kwargs.get('thread'))
+        if new_thread is not None:
+            thread_ids.add(getattr(new_thread, 'pk', new_thread))
+        _bump_message_versions(thread_ids)
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        _bump_message_versions({obj.thread_id for obj in objs})
+        return objs
+
+    def bulk_update(self, objs, *args, **kwargs):
+        objs = list(objs)
+        rows = super().bulk_update(objs, *args, **kwargs)
+        _bump_message_versions({obj.thread_id for obj in objs})
+        return rows
+
+
+def _bump_message_versions(thread_ids):
+    from .message_cache import bump_thread_messages_version
+
+    for thread_id in thread_ids:
+        bump_thread_messages_version(thread_id)
+
+
 class ChatMessage(models.Model):
     thread = models.ForeignKey(ChatThread, on_delete=models.CASCADE, related_name="messages")
     sender = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="sent_chat_messages")
@@ -115,8 +287,14 @@ class ChatMessage(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
 
+    objects = ChatMessageQuerySet.as_manager()
+
     class Meta:
         ordering = ['created_at']
+        # Message pages are a thread's rows in created_at order
+        indexes = [
+            models.Index(fields=['thread', 'created_at'], name='chatmessage_thread_created_idx'),
+        ]
 
     def __str__(self):
         return f"Message from {self.sender.username} in thread {self.thread.id}"
@@ -245,6 +423,32 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        # One notification per (sender, receiver, type, post, comment), so
+        # inserts can rely on ON CONFLICT DO NOTHING instead of a pre-SELECT.
+        # post/comment are coalesced because NULLs never conflict otherwise
+        constraints = [
+            models.UniqueConstraint(
+                models.F('sender'),
+                models.F('receiver'),
+                models.F('notification_type'),
+                Coalesce('post', models.Value(0)),
+                Coalesce('comment', models.Value(0)),
+                name='unique_notification',
+            ),
+        ]
+        # Unread counts / mark-all-read filter on (receiver, is_read) and
+        # unread lists come back newest first off the same index;
+        # the notification list reads (receiver, -created_at)
+        indexes = [
+            models.Index(
+                fields=['receiver', '-created_at'],
+                name='notif_receiver_created_idx',
+            ),
+            models.Index(
+                fields=['receiver', 'is_read', '-created_at'],
+                name='notif_receiver_read_idx',
+            ),
+        ]
 
     def __str__(self):
         if self.post:
@@ -1,9 +1,50 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+from django.utils.functional import cached_property
+from django.core.files.storage import default_storage
 from .models import Post, Comment, Like, Save, Notification, ChatThread, ChatMessage
 
 User = get_user_model()
 
+# Max characters of post caption / comment text shown in a notification
+NOTIFICATION_PREVIEW_LENGTH = 50
+
+
+def build_media_url(file, context):
+    """
+    Returns the URL for a stored file, made absolute when a request is in context.
+    The `scheme://host` prefix is computed once and cached in the (shared)
+    serializer context, so nested/many serializers just concatenate strings.
+    """
+    return build_storage_media_url(file.storage, file.name, context)
+
+
+def build_storage_media_url(storage, name, context):
+    """
+    Returns the absolute URL for a file name in `storage`.
+    URLs are memoized per response in the context, so a file that appears on
+    many rows (e.g. the author's profile picture) hits the storage backend once.
+    """
+    urls = context.setdefault('media_urls', {})
+    if name not in urls:
+        urls[name] = build_absolute_media_url(storage.url(name), context)
+    return urls[name]
+
+
+def build_absolute_media_url(url, context):
+    """
+    Makes a storage URL absolute using the cached `base_uri` from context.
+    """
+    request = context.get('request')
+    if not request or not url.startswith('/'):
+        return url
+
+    base_uri = context.get('base_uri')
+    if base_uri is None:
+        base_uri = context['base_uri'] = request.build_absolute_uri('/')[:-1]
+    return base_uri + url
+
 
 class UserSummarySerializer(serializers.ModelSerializer):
     """
@@ -21,10 +62,7 @@ class UserSummarySerializer(serializers.ModelSerializer):
         Returns the full URL for profile picture or None if not set.
         """
         if obj.profile_picture:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.profile_picture.url)
-            return obj.profile_picture.url
+            return build_media_url(obj.profile_picture, self.context)
         return None
 
 
@@ -35,8 +73,8 @@ class PostSerializer(serializers.ModelSerializer):
     """
     user = UserSummarySerializer(read_only=True)
     image = serializers.SerializerMethodField()
-    like_count = serializers.SerializerMethodField()
-    comment_count = serializers.SerializerMethodField()
+    like_count = serializers.IntegerField(read_only=True)
+    comment_count = serializers.IntegerField(read_only=True)
     is_liked = serializers.SerializerMethodField()
     is_saved = serializers.SerializerMethodField()
 
@@ -52,43 +90,111 @@ class PostSerializer(serializers.ModelSerializer):
         Returns the full URL for post image.
         """
         if obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
+            return build_media_url(obj.image, self.context)
         return None
 
-    def get_like_count(self, obj):
-        """
-        Returns the total number of likes for this post.
-        """
-        return obj.likes.count()
-
-    def get_comment_count(self, obj):
-        """
-        Returns the total number of comments for this post.
-        """
-        return obj.comments.count()
-
     def get_is_liked(self, obj):
         """
         Returns True if the current user has liked this post.
         Returns False for anonymous users.
+        Uses the `is_liked` annotation when the queryset provides one.
         """
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return Like.objects.filter(user=request.user, post=obj).exists()
-        return False
+        if hasattr(obj, 'is_liked'):
+            return obj.is_liked
+        return obj.id in self.get_user_flags(obj)['liked']
 
     def get_is_saved(self, obj):
         """
         Returns True if the current user has saved this post.
         Returns False for anonymous users.
+        Uses the `is_saved` annotation when the queryset provides one.
+        """
+        if hasattr(obj, 'is_saved'):
+            return obj.is_saved
+        return obj.id in self.get_user_flags(obj)['saved']
+
+    def get_user_flags(self, obj):
+        """
+        Returns the sets of post ids the current user has liked/saved.
+        On first use the flags for every post in the list being serialized
+        are fetched in one query and kept in the context.
         """
         request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return Save.objects.filter(user=request.user, post=obj).exists()
-        return False
+        if not (request and request.user.is_authenticated):
+            return {'liked': set(), 'saved': set()}
+
+        flags = self.context.setdefault(
+            'user_flags', {'checked': set(), 'liked': set(), 'saved': set()}
+        )
+        if obj.id not in flags['checked']:
+            posts = [obj]
+            if isinstance(self.parent, serializers.ListSerializer) and self.parent.instance is not None:
+                posts = self.parent.instance
+            post_ids = {post.id for post in posts}
+            liked, saved = Post.get_user_flags(request.user, post_ids)
+            flags['checked'] |= post_ids
+            flags['liked'] |= liked
+            flags['saved'] |= saved
+        return flags
+
+
+class PostImageField(serializers.ImageField):
+    """
+    Image field for post uploads.
+    Checks file size and format before ImageField's own validation,
+    which opens and verifies the whole file with Pillow.
+    """
+    max_size = 10 * 1024 * 1024  # 10MB
+    allowed_formats = ['image/jpeg', 'image/jpg', 'image/png', 'image/gif']
+
+    def to_internal_value(self, data):
+        if getattr(data, 'size', 0) > self.max_size:
+            raise serializers.ValidationError("Image file too large. Maximum size is 10MB.")
+
+        if hasattr(data, 'content_type') and data.content_type not in self.allowed_formats:
+            raise serializers.ValidationError(
+                "Unsupported image format. Please use JPEG, PNG, or GIF."
+            )
+        return super().to_internal_value(data)
+
+
+# Columns serialize_post_values() expects, in `.values()` form
+POST_VALUES_FIELDS = (
+    'id', 'image', 'caption', 'created_at', 'is_private', 'like_count', 'comment_count',
+    'user__id', 'user__username', 'user__profile_picture', 'is_liked', 'is_saved'
+)
+
+
+def serialize_post_values(rows, context):
+    """
+    Builds PostSerializer-shaped dicts straight from `.values(*POST_VALUES_FIELDS)`
+    rows, skipping model instances and per-field serializer dispatch.
+    Reserved for hot list endpoints; keep in sync with PostSerializer.
+    """
+    created_at_field = serializers.DateTimeField()
+
+    def media_url(name):
+        return build_storage_media_url(default_storage, name, context) if name else None
+
+    return [
+        {
+            'id': row['id'],
+            'user': {
+                'id': row['user__id'],
+                'username': row['user__username'],
+                'profile_picture': media_url(row['user__profile_picture'])
+            },
+            'image': media_url(row['image']),
+            'caption': row['caption'],
+            'created_at': created_at_field.to_representation(row['created_at']),
+            'is_private': row['is_private'],
+            'like_count': row['like_count'],
+            'comment_count': row['comment_count'],
+            'is_liked': row['is_liked'],
+            'is_saved': row['is_saved']
+        }
+        for row in rows
+    ]
 
 
 class CreatePostSerializer(serializers.ModelSerializer):
@@ -96,29 +202,13 @@ class CreatePostSerializer(serializers.ModelSerializer):
     Serializer for creating new posts.
     Automatically sets the user from the request.
     """
+    image = PostImageField(max_length=Post._meta.get_field('image').max_length)
     is_private = serializers.BooleanField(required=False, default=False, write_only=True)
 
     class Meta:
         model = Post
         fields = ['image', 'caption', 'is_private']
 
-    def validate_image(self, value):
-        """
-        Validate image file size and format.
-        """
-        if value:
-            # Check file size (limit to 10MB)
-            if value.size > 10 * 1024 * 1024:
-                raise serializers.ValidationError("Image file too large. Maximum size is 10MB.")
-            
-            # Check file format
-            allowed_formats = ['image/jpeg', 'image/jpg', 'image/png', 'image/gif']
-            if hasattr(value, 'content_type') and value.content_type not in allowed_formats:
-                raise serializers.ValidationError(
-                    "Unsupported image format. Please use JPEG, PNG, or GIF."
-                )
-        return value
-
     def validate_caption(self, value):
         """
         Validate caption length.
@@ -150,7 +240,7 @@ class CommentSerializer(serializers.ModelSerializer):
     Includes user details and post reference.
     """
     user = UserSummarySerializer(read_only=True)
-    post = serializers.PrimaryKeyRelatedField(queryset=Post.objects.all())
+    post = serializers.PrimaryKeyRelatedField(queryset=Post.objects.only('id'))
 
     class Meta:
         model = Comment
@@ -160,7 +250,7 @@ class CommentSerializer(serializers.ModelSerializer):
         """
         Validate comment text.
         """
-        if not value or not value.strip():
+        if not value or value.isspace():
             raise serializers.ValidationError("Comment text cannot be empty.")
         
         if len(value) > 500:  # Reasonable comment length limit
@@ -194,6 +284,8 @@ class CreateCommentSerializer(serializers.ModelSerializer):
     Simplified serializer for creating comments.
     Only requires text and post ID.
     """
+    # The post owner is kept so the comment notification can be addressed
+    post = serializers.PrimaryKeyRelatedField(queryset=Post.objects.only('id', 'user'))
     
     class Meta:
         model = Comment
@@ -203,7 +295,7 @@ class CreateCommentSerializer(serializers.ModelSerializer):
         """
         Validate comment text.
         """
-        if not value or not value.strip():
+        if not value or value.isspace():
             raise serializers.ValidationError("Comment text cannot be empty.")
         
         if len(value) > 500:
@@ -224,6 +316,16 @@ class CreateCommentSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+def requested_fields(request):
+    """
+    Field names asked for with `?fields=id,text`, or None for all fields.
+    """
+    fields = request.query_params.get('fields')
+    if not fields:
+        return None
+    return {name.strip() for name in fields.split(',') if name.strip()}
+
+
 class ChatMessageSerializer(serializers.ModelSerializer):
     """
     Serializer for chat messages.
@@ -233,7 +335,57 @@ class ChatMessageSerializer(serializers.ModelSerializer):
     class Meta:
         model = ChatMessage
         fields = ['id', 'thread', 'sender', 'text', 'created_at', 'is_read']
-        read_only_fields = ['id', 'sender', 'created_at', 'is_read']
+        read_only_fields = ['id', 'thread', 'sender', 'created_at', 'is_read']
+
+
+# ChatMessageSerializer output keys and the `.values()` columns each is built from
+MESSAGE_VALUES_FIELDS = {
+    'id': ('id',),
+    'thread': ('thread',),
+    'sender': ('sender__id', 'sender__username', 'sender__profile_picture'),
+    'text': ('text',),
+    'created_at': ('created_at',),
+    'is_read': ('is_read',),
+}
+
+
+def message_values_columns(fields=None):
+    """
+    `.values()` columns for the requested output keys (all when None).
+    created_at is always included; message pages are cursored on it.
+    """
+    columns = ['created_at']
+    for key, key_columns in MESSAGE_VALUES_FIELDS.items():
+        if fields is None or key in fields:
+            columns += [column for column in key_columns if column not in columns]
+    return columns
+
+
+def serialize_message_values(rows, context, fields=None):
+    """
+    Builds ChatMessageSerializer-shaped dicts straight from
+    `.values(*message_values_columns(fields))` rows, limited to `fields`.
+    Reserved for message lists; keep in sync with ChatMessageSerializer.
+    """
+    created_at_field = serializers.DateTimeField()
+
+    def media_url(name):
+        return build_storage_media_url(default_storage, name, context) if name else None
+
+    builders = {
+        'id': lambda row: row['id'],
+        'thread': lambda row: row['thread'],
+        'sender': lambda row: {
+            'id': row['sender__id'],
+            'username': row['sender__username'],
+            'profile_picture': media_url(row['sender__profile_picture'])
+        },
+        'text': lambda row: row['text'],
+        'created_at': lambda row: created_at_field.to_representation(row['created_at']),
+        'is_read': lambda row: row['is_read'],
+    }
+    keys = [key for key in builders if fields is None or key in fields]
+    return [{key: builders[key](row) for key in keys} for row in rows]
 
 
 class ChatThreadSerializer(serializers.ModelSerializer):
@@ -249,19 +401,58 @@ class ChatThreadSerializer(serializers.ModelSerializer):
         fields = ['id', 'participants', 'other_participant', 'last_message', 'updated_at', 'is_accepted']
 
     def get_last_message(self, obj):
+        """
+        Returns the latest message in the thread.
+        Built from the `last_message_*` annotations when the view provides
+        them, resolving the sender from the thread's participants.
+        """
+        if hasattr(obj, 'last_message_id'):
+            if obj.last_message_id is None:
+                return None
+            sender = next(
+                (user for user in obj.participants.all() if user.id == obj.last_message_sender_id),
+                None
+            )
+            if sender:
+                return {
+                    'id': obj.last_message_id,
+                    'thread': obj.id,
+                    'sender': self.message_sender_serializer.to_representation(sender),
+                    'text': obj.last_message_text,
+                    # Reuse a bound DateTimeField so the format matches ChatMessageSerializer
+                    'created_at': self.fields['updated_at'].to_representation(obj.last_message_created_at),
+                    'is_read': obj.last_message_is_read
+                }
+
         last_msg = obj.messages.last()
         if last_msg:
             return ChatMessageSerializer(last_msg).data
         return None
 
     def get_other_participant(self, obj):
+        """
+        Returns the first participant who isn't the current user.
+        Iterates participants.all() so a prefetched list is reused.
+        """
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            other_user = obj.participants.exclude(id=request.user.id).first()
+            other_user = next(
+                (user for user in obj.participants.all() if user.id != request.user.id),
+                None
+            )
             if other_user:
-                return UserSummarySerializer(other_user, context=self.context).data
+                # Reuse the bound participants serializer instead of building one per thread
+                return self.fields['participants'].child.to_representation(other_user)
         return None
 
+    @cached_property
+    def message_sender_serializer(self):
+        """
+        Context-free user serializer for last-message senders, matching
+        ChatMessageSerializer's output. Built once, not per thread.
+        """
+        return UserSummarySerializer()
+
 
 class NotificationSerializer(serializers.ModelSerializer):
     """
@@ -279,46 +470,60 @@ class NotificationSerializer(serializers.ModelSerializer):
     def get_post(self, obj):
         """
         Returns basic post info if post exists.
+        Uses the `post_caption_preview` annotation when the view provides it.
         """
         if obj.post:
+            if hasattr(obj, 'post_caption_preview'):
+                caption = obj.post_caption_preview
+            else:
+                caption = obj.post.caption
             return {
                 'id': obj.post.id,
                 'image': self.get_post_image_url(obj.post),
-                'caption': obj.post.caption[:50] + '...' if len(obj.post.caption) > 50 else obj.post.caption
+                'caption': self.truncate_preview(caption)
             }
         return None
 
     def get_comment(self, obj):
         """
         Returns basic comment info if comment exists.
+        Uses the `comment_text_preview` annotation when the view provides it.
         """
         if obj.comment:
+            if hasattr(obj, 'comment_text_preview'):
+                text = obj.comment_text_preview
+            else:
+                text = obj.comment.text
             return {
                 'id': obj.comment.id,
-                'text': obj.comment.text[:50] + '...' if len(obj.comment.text) > 50 else obj.comment.text,
-                'post_id': obj.comment.post.id
+                'text': self.truncate_preview(text),
+                'post_id': obj.comment.post_id
             }
         return None
 
+    def truncate_preview(self, value):
+        """
+        Helper to shorten caption/comment text for display.
+        """
+        if len(value) > NOTIFICATION_PREVIEW_LENGTH:
+            return value[:NOTIFICATION_PREVIEW_LENGTH] + '...'
+        return value
+
     def get_post_image_url(self, post):
         """
         Helper to get post image URL.
         """
         if post.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(post.image.url)
-            return post.image.url
+            return build_media_url(post.image, self.context)
         return None
 
     def get_time_ago(self, obj):
         """
         Returns time ago string.
+        Measured against `now` from the context when the view provides it,
+        so a list of notifications shares a single clock reading.
         """
-        from django.utils import timezone
-        from datetime import datetime, timedelta
-        
-        now = timezone.now()
+        now = self.context.get('now') or timezone.now()
         diff = now - obj.created_at
         
         if diff.days > 0:
@@ -336,8 +541,28 @@ class SavedPostSerializer(serializers.ModelSerializer):
     Serializer for saved posts.
     Includes the full post details for displaying in saved posts list.
     """
-    post = PostSerializer(read_only=True)
+    post = serializers.SerializerMethodField()
     
     class Meta:
         model = Save
         fields = ['id', 'post', 'created_at']
+
+    @cached_property
+    def post_serializer(self):
+        """
+        One PostSerializer shared by every saved row.
+        It is bound to all of the saved posts being listed, so the current
+        user's like/save flags are fetched in a batch rather than per row.
+        """
+        saves = [self.instance]
+        if isinstance(self.parent, serializers.ListSerializer) and self.parent.instance is not None:
+            saves = self.parent.instance
+        return PostSerializer(
+            [save.post for save in saves], many=True, context=self.context
+        ).child
+
+    def get_post(self, obj):
+        """
+        Returns the full post details for this save.
+        """
+        return self.post_serializer.to_representation(obj.post)
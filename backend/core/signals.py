@@ -0,0 +1,112 @@
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .models import CustomUser, Follow, Post, Like, Comment, Save, ChatMessage, ChatThreadParticipant
+from .message_cache import bump_thread_messages_version, thread_membership_cache_key
+from .tokens import auth_token_cache_key
+
+# Reaction model -> Post counter column it is counted in
+POST_COUNTER_FIELDS = {
+    Like: 'like_count',
+    Comment: 'comment_count',
+    Save: 'save_count',
+}
+
+
+def adjust_post_counter(post_id, field, delta):
+    """
+    Atomically add `delta` to one of a post's counter columns.
+    """
+    Post.objects.filter(pk=post_id).update(**{field: F(field) + delta})
+
+
+@receiver(post_save, sender=Like)
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=Save)
+def reaction_created(sender, instance, created, **kwargs):
+    # Edits to an existing row don't change counts
+    if created:
+        adjust_post_counter(instance.post_id, POST_COUNTER_FIELDS[sender], 1)
+
+
+@receiver(post_delete, sender=Like)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=Save)
+def reaction_deleted(sender, instance, **kwargs):
+    adjust_post_counter(instance.post_id, POST_COUNTER_FIELDS[sender], -1)
+
+
+def adjust_user_counter(user_id, field, delta):
+    """
+    Atomically add `delta` to one of a user's profile counter columns.
+    """
+    CustomUser.objects.filter(pk=user_id).update(**{field: F(field) + delta})
+
+
+@receiver(post_save, sender=Follow)
+def follow_created(sender, instance, created, **kwargs):
+    if created:
+        adjust_user_counter(instance.follower_id, 'following_count', 1)
+        adjust_user_counter(instance.following_id, 'followers_count', 1)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    adjust_user_counter(instance.follower_id, 'following_count', -1)
+    adjust_user_counter(instance.following_id, 'followers_count', -1)
+
+
+@receiver(post_save, sender=Post)
+def post_created(sender, instance, created, **kwargs):
+    if created:
+        adjust_user_counter(instance.user_id, 'posts_count', 1)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    adjust_user_counter(instance.user_id, 'posts_count', -1)
+
+
+@receiver(post_delete, sender=Token)
+def auth_token_deleted(sender, instance, **kwargs):
+    # Logins must not hand out a key that no longer authenticates
+    cache.delete(auth_token_cache_key(instance.user_id))
+
+
+@receiver(post_save, sender=ChatMessage)
+@receiver(post_delete, sender=ChatMessage)
+def chat_message_changed(sender, instance, **kwargs):
+    # Cached message pages of the thread no longer match
+    bump_thread_messages_version(instance.thread_id)
+
+
+@receiver(post_delete, sender=ChatThreadParticipant)
+def chat_participant_removed(sender, instance, **kwargs):
+    # A removed participant must lose access straight away
+    cache.delete(thread_membership_cache_key(instance.customuser_id, instance.chatthread_id))
+
+
+@receiver(m2m_changed, sender=ChatThreadParticipant)
+def chat_participants_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    # participants.remove() and .clear() delete rows without post_delete
+    if action == 'pre_clear':
+        # post_clear gets no pk_set, so note the rows about to go
+        field = 'chatthread_id' if reverse else 'customuser_id'
+        lookup = 'customuser_id' if reverse else 'chatthread_id'
+        instance._cleared_chat_participants = list(
+            sender.objects.filter(**{lookup: instance.pk}).values_list(field, flat=True)
+        )
+        return
+    if action == 'post_clear':
+        pk_set = getattr(instance, '_cleared_chat_participants', [])
+    elif action != 'post_remove':
+        return
+
+    if reverse:
+        keys = [thread_membership_cache_key(instance.pk, thread_id) for thread_id in pk_set]
+    else:
+        keys = [thread_membership_cache_key(user_id, instance.pk) for user_id in pk_set]
+    cache.delete_many(keys)
@@ -0,0 +1,158 @@
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from .models import CustomUser, Post, Like, Comment, Notification, ChatThread, ChatMessage
+from .tokens import get_auth_token_key
+
+
+def create_user(username):
+    return CustomUser.objects.create_user(
+        username=username, email=f'{username}@example.com', password='test-pass-123'
+    )
+
+
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class MessagePostTests(APITestCase):
+    def setUp(self):
+        self.alice = create_user('alice')
+        self.bob = create_user('bob')
+        self.thread = ChatThread.objects.create(initiator=self.alice, is_accepted=True)
+        self.thread.participants.add(self.alice, self.bob)
+        self.url = f'/api/messages/threads/{self.thread.id}/'
+
+        # Stand in for a websocket connected to the thread
+        self.layer = get_channel_layer()
+        self.channel = async_to_sync(self.layer.new_channel)()
+        async_to_sync(self.layer.group_add)(f'chat_{self.thread.id}', self.channel)
+
+    def test_post_saves_message_and_broadcasts_it(self):
+        self.client.force_authenticate(self.alice)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, {'text': 'hi'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['thread'], self.thread.id)
+        message = ChatMessage.objects.get()
+        self.assertEqual((message.sender, message.text), (self.alice, 'hi'))
+
+        event = async_to_sync(self.layer.receive)(self.channel)
+        self.assertEqual(event['type'], 'chat_message')
+        self.assertEqual(event['message_data']['id'], message.id)
+        self.assertEqual(event['message_data']['thread_id'], self.thread.id)
+        self.assertEqual(event['message_data']['sender']['username'], 'alice')
+
+    def test_new_message_shows_up_in_cached_list(self):
+        self.client.force_authenticate(self.alice)
+        self.assertEqual(self.client.get(self.url).data['results'], [])
+        self.client.post(self.url, {'text': 'hi'}, format='json')
+
+        results = self.client.get(self.url).data['results']
+        self.assertEqual([row['text'] for row in results], ['hi'])
+
+    def test_non_participant_cannot_post(self):
+        self.client.force_authenticate(create_user('carol'))
+        response = self.client.post(self.url, {'text': 'hi'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(ChatMessage.objects.exists())
+
+    def test_unaccepted_thread_rejects_post(self):
+        self.thread.is_accepted = False
+        self.thread.save(update_fields=['is_accepted'])
+        self.client.force_authenticate(self.alice)
+        response = self.client.post(self.url, {'text': 'hi'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class LikeToggleTests(APITestCase):
+    def setUp(self):
+        self.owner = create_user('owner')
+        self.fan = create_user('fan')
+        self.post = Post.objects.create(user=self.owner, image='posts/test.png', caption='test')
+        self.url = f'/api/posts/{self.post.id}/like/'
+        self.client.force_authenticate(self.fan)
+
+    def assertLikeCount(self, expected):
+        self.post.refresh_from_db(fields=['like_count'])
+        self.assertEqual(self.post.like_count, expected)
+        self.assertEqual(Like.objects.filter(post=self.post).count(), expected)
+
+    def test_like_then_unlike_keeps_counter_in_sync(self):
+        response = self.client.post(self.url)
+        self.assertEqual((response.data['liked'], response.data['like_count']), (True, 1))
+        self.assertLikeCount(1)
+
+        response = self.client.post(self.url)
+        self.assertEqual((response.data['liked'], response.data['like_count']), (False, 0))
+        self.assertLikeCount(0)
+
+    def test_likes_from_several_users_are_counted(self):
+        self.client.post(self.url)
+        self.client.force_authenticate(self.owner)
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.data['like_count'], 2)
+        self.assertLikeCount(2)
+
+    def test_comment_counter_follows_creates_and_deletes(self):
+        comment = Comment.objects.create(user=self.fan, post=self.post, text='nice')
+        self.post.refresh_from_db(fields=['comment_count'])
+        self.assertEqual(self.post.comment_count, 1)
+
+        comment.delete()
+        self.post.refresh_from_db(fields=['comment_count'])
+        self.assertEqual(self.post.comment_count, 0)
+
+
+class NotificationDedupeTests(APITestCase):
+    def setUp(self):
+        self.owner = create_user('owner')
+        self.fan = create_user('fan')
+        self.post = Post.objects.create(user=self.owner, image='posts/test.png', caption='test')
+        self.client.force_authenticate(self.fan)
+
+    def test_relike_does_not_duplicate_notification(self):
+        url = f'/api/posts/{self.post.id}/like/'
+        for _ in range(3):  # like, unlike, like again
+            self.client.post(url)
+
+        notifications = Notification.objects.filter(receiver=self.owner, notification_type='like')
+        self.assertEqual(notifications.count(), 1)
+        self.assertEqual(notifications.get().sender, self.fan)
+
+    def test_self_like_creates_no_notification(self):
+        self.client.force_authenticate(self.owner)
+        self.client.post(f'/api/posts/{self.post.id}/like/')
+
+        self.assertFalse(Notification.objects.exists())
+
+
+class LogoutTests(APITestCase):
+    def setUp(self):
+        self.user = create_user('leaving')
+        self.token_key = get_auth_token_key(self.user)
+
+    def assertTokenRevoked(self):
+        self.assertFalse(Token.objects.filter(user=self.user).exists())
+        self.client.logout()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token_key}')
+        self.assertEqual(self.client.get('/api/users/me/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_logout_revokes_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token_key}')
+        response = self.client.post('/api/auth/logout/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTokenRevoked()
+
+    def test_session_logout_revokes_token(self):
+        self.client.force_login(self.user)
+        response = self.client.post('/api/auth/logout/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTokenRevoked()
@@ -0,0 +1,43 @@
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from rest_framework.authtoken.models import Token
+
+AUTH_TOKEN_CACHE_TIMEOUT = 60 * 60  # 1 hour
+
+
+def auth_token_cache_key(user_id):
+    """
+    Cache key for a user's auth token key.
+    """
+    return f'auth_token:{user_id}'
+
+
+def get_auth_token_key(user):
+    """
+    Returns the user's auth token key, creating the token if needed.
+    Repeat logins are served from the cache instead of a get_or_create.
+    The signals in signals.py drop the cached key when the token is deleted.
+    """
+    cache_key = auth_token_cache_key(user.id)
+    token_key = cache.get(cache_key)
+    if token_key is None:
+        token_key = _load_or_create_token_key(user)
+        cache.set(cache_key, token_key, AUTH_TOKEN_CACHE_TIMEOUT)
+    return token_key
+
+
+def _load_or_create_token_key(user):
+    """
+    Reads just the key column instead of the whole Token row; the INSERT
+    only runs for users who have no token yet.
+    """
+    tokens = Token.objects.filter(user_id=user.id).values_list('key', flat=True)
+    token_key = tokens.first()
+    if token_key is None:
+        try:
+            with transaction.atomic():
+                token_key = Token.objects.create(user=user).key
+        except IntegrityError:
+            # A concurrent login created the token first
+            token_key = tokens.get()
+    return token_key
@@ -8,12 +8,13 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "instaclone.settings")
 django_asgi_app = get_asgi_application()
 
 # Now import the rest after Django is initialized
-from channels.routing import ProtocolTypeRouter, URLRouter
+from channels.routing import ChannelNameRouter, ProtocolTypeRouter, URLRouter
 from channels.security.websocket import AllowedHostsOriginValidator
 from core.middleware import TokenAuthMiddlewareStack
 import core.routing
+from core.consumers import NotificationWorker
 
-# Combine WebSocket routing
+# Combine WebSocket routing and the background notifications worker
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
     "websocket": AllowedHostsOriginValidator(
@@ -21,5 +22,8 @@ application = ProtocolTypeRouter({
             URLRouter(core.routing.websocket_urlpatterns)
         )
     ),
+    "channel": ChannelNameRouter({
+        "notifications": NotificationWorker.as_asgi(),
+    }),
 })
 
@@ -72,6 +72,10 @@ else:
             'PASSWORD': os.getenv("POSTGRES_PASSWORD"),
             'HOST': os.getenv("POSTGRES_HOST"),
             'PORT': os.getenv("POSTGRES_PORT", "5432"),
+            # Reuse connections across requests instead of reconnecting each time;
+            # set to 0 when running behind a transaction-pooling PgBouncer
+            'CONN_MAX_AGE': config("DATABASE_CONN_MAX_AGE", default=60, cast=int),
+            'CONN_HEALTH_CHECKS': True,
         }
     }
 
@@ -105,9 +109,10 @@ REST_FRAMEWORK = {
         'rest_framework.parsers.FormParser',
         'rest_framework.parsers.MultiPartParser',
     ],
+    # The browsable API is a development aid; production serves JSON only
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
+        'core.renderers.ORJSONRenderer',
+        *(['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.TokenAuthentication',
@@ -122,28 +127,51 @@ REST_FRAMEWORK = {
     'DATE_FORMAT': '%Y-%m-%d',
 }
 
-FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
-DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024   # 10MB
+# Uploads above 256KB are streamed to a temporary file on disk instead of
+# being held in memory; PostImageField still caps images at 10MB
+FILE_UPLOAD_MAX_MEMORY_SIZE = 256 * 1024  # 256KB
+# Excludes uploaded files, so this only bounds JSON and form fields
+DATA_UPLOAD_MAX_MEMORY_SIZE = 2 * 1024 * 1024   # 2MB
 
+REDIS_URL = config("REDIS_URL", default="redis://localhost:6379/0")
+CACHE_BACKEND = config("CACHE_BACKEND", default="django.core.cache.backends.db.DatabaseCache")
+
+# Redis keeps cache reads and writes off the main database; the database
+# cache (run `manage.py createcachetable`) is the default for local setups
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
-        'LOCATION': 'instaclone_cache',
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': REDIS_URL if "RedisCache" in CACHE_BACKEND else 'instaclone_cache',
     }
 }
 
-REDIS_URL = config("REDIS_URL", default="redis://localhost:6379/0")
-CHANNEL_BACKEND = config("CHANNEL_BACKEND", default="channels.layers.InMemoryChannelLayer")
+# Redis lets group_send reach consumers in every worker process; the
+# in-memory layer only works within a single process
+CHANNEL_BACKEND = config("CHANNEL_BACKEND", default="channels_redis.core.RedisChannelLayer")
+CHANNEL_LAYER_EXPIRY = config("CHANNEL_LAYER_EXPIRY", default=10, cast=int)
 
 CHANNEL_LAYERS = {
     "default": {
         "BACKEND": CHANNEL_BACKEND,
         "CONFIG": {
             "hosts": [REDIS_URL],
+            # Messages per channel before sends fail, and seconds an
+            # undelivered message is kept
+            "capacity": 1500,
+            "expiry": CHANNEL_LAYER_EXPIRY,
         } if "RedisChannelLayer" in CHANNEL_BACKEND else {},
     },
 }
 
+# Queue notifications for `manage.py runworker notifications` instead of
+# inserting them during the request. Needs a cross-process channel layer
+# (RedisChannelLayer); the in-memory layer never reaches the worker.
+# Delivery is at most once: a job the worker has not picked up within
+# CHANNEL_LAYER_EXPIRY seconds (worker down or lagging) is dropped without
+# an error, and once `capacity` jobs are queued create_notification() only
+# logs the failed send. Raise CHANNEL_LAYER_EXPIRY when running with this on.
+NOTIFICATIONS_ASYNC = config("NOTIFICATIONS_ASYNC", default=False, cast=bool)
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
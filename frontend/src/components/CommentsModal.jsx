@@ -8,6 +8,8 @@ const CommentsModal = ({ post, isOpen, onClose }) => {
     const [comments, setComments] = useState([])
     const [newComment, setNewComment] = useState('')
     const [loading, setLoading] = useState(false)
+    const [nextUrl, setNextUrl] = useState(null)
+    const [loadingMore, setLoadingMore] = useState(false)
     const [submitting, setSubmitting] = useState(false)
 
     useEffect(() => {
@@ -37,6 +39,7 @@ const CommentsModal = ({ post, isOpen, onClose }) => {
             setLoading(true)
             const response = await commentsAPI.getComments(post.id)
             setComments(response.data.results || [])
+            setNextUrl(response.data.next || null)
         } catch (error) {
             console.error('Error fetching comments:', error)
         } finally {
@@ -44,6 +47,20 @@ const CommentsModal = ({ post, isOpen, onClose }) => {
         }
     }
 
+    const fetchMoreComments = async () => {
+        if (!nextUrl || loadingMore) return
+        try {
+            setLoadingMore(true)
+            const response = await commentsAPI.getComments(post.id, nextUrl)
+            setComments(prev => [...prev, ...(response.data.results || [])])
+            setNextUrl(response.data.next || null)
+        } catch (error) {
+            console.error('Error fetching more comments:', error)
+        } finally {
+            setLoadingMore(false)
+        }
+    }
+
     const handleSubmitComment = async (e) => {
         e.preventDefault()
         if (!newComment.trim()) return
@@ -117,24 +134,37 @@ const CommentsModal = ({ post, isOpen, onClose }) => {
                             ))}
                         </div>
                     ) : comments.length > 0 ? (
-                        comments.map((comment) => (
-                            <div key={comment.id} className="flex space-x-3">
-                                <Avatar
-                                    src={comment.user?.profile_picture}
-                                    alt={comment.user?.username || 'Unknown User'}
-                                    size="sm"
-                                />
-                                <div className="flex-1">
-                                    <p className="text-sm">
-                                        <span className="font-semibold">{comment.user?.username || 'Unknown User'}</span>
-                                        <span className="ml-2 text-gray-700">{comment.text}</span>
-                                    </p>
-                                    <p className="text-xs text-gray-500 mt-1">
-                                        {formatTimeAgo(comment.created_at)}
-                                    </p>
+                        <>
+                            {comments.map((comment) => (
+                                <div key={comment.id} className="flex space-x-3">
+                                    <Avatar
+                                        src={comment.user?.profile_picture}
+                                        alt={comment.user?.username || 'Unknown User'}
+                                        size="sm"
+                                    />
+                                    <div className="flex-1">
+                                        <p className="text-sm">
+                                            <span className="font-semibold">{comment.user?.username || 'Unknown User'}</span>
+                                            <span className="ml-2 text-gray-700">{comment.text}</span>
+                                        </p>
+                                        <p className="text-xs text-gray-500 mt-1">
+                                            {formatTimeAgo(comment.created_at)}
+                                        </p>
+                                    </div>
+                                </div>
+                            ))}
+                            {nextUrl && (
+                                <div className="text-center">
+                                    <button
+                                        onClick={fetchMoreComments}
+                                        disabled={loadingMore}
+                                        className="text-sm text-pink-500 hover:text-pink-600 disabled:opacity-50"
+                                    >
+                                        {loadingMore ? 'Loading...' : 'Load more comments'}
+                                    </button>
                                 </div>
-                            </div>
-                        ))
+                            )}
+                        </>
                     ) : (
                         <div className="text-center py-8">
                             <p className="text-gray-500">No comments yet</p>
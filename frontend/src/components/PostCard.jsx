@@ -60,7 +60,7 @@ const ShareModal = ({ isOpen, onClose, post }) => {
             const shareMessage = `🔗 Shared a post from @${post.user.username}\n\n"${post.caption || 'No caption'}"\n\n💖 ${post.like_count || 0} likes • 💬 ${post.comment_count || 0} comments`
 
             // Send the message
-            await messagesAPI.sendMessage(threadId, shareMessage)
+            await messagesAPI.createMessage(threadId, shareMessage)
 
             // Dispatch event to notify MessagesPage to refresh
             window.dispatchEvent(new CustomEvent('shared-post-message', {
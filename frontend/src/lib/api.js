@@ -160,7 +160,7 @@ export const usersAPI = {
 }
 
 export const commentsAPI = {
-    getComments: (postId) => api.get(`/posts/${postId}/comments/`),
+    getComments: (postId, nextUrl) => api.get(nextUrl || `/posts/${postId}/comments/`),
     createComment: (data) => api.post('/comments/', data),
 }
 
@@ -168,7 +168,7 @@ export const messagesAPI = {
     getThreads: () => api.get('/messages/threads/'),
     startThread: (receiverId) => api.post('/messages/start/', { receiver_id: receiverId }),
     acceptThread: (threadId) => api.post(`/messages/threads/${threadId}/accept/`),
-    getMessages: (threadId) => api.get(`/messages/threads/${threadId}/`),
+    getMessages: (threadId, olderUrl) => api.get(olderUrl || `/messages/threads/${threadId}/`),
     createMessage: (threadId, text) => api.post(`/messages/threads/${threadId}/`, { text }),
 }
 
@@ -179,7 +179,8 @@ export const notificationsAPI = {
 }
 
 export const feedAPI = {
-    getFeed: () => api.get('/feed/'),
+    // Pass the previous page's `next` URL to fetch the following page
+    getFeed: (nextUrl) => api.get(nextUrl || '/feed/'),
 }
 
 export default api
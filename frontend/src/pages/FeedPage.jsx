@@ -203,6 +203,8 @@ const SuggestedUsersBox = () => {
 
 const FeedPage = () => {
     const [posts, setPosts] = useState([])
+    const [nextUrl, setNextUrl] = useState(null)
+    const [loadingMore, setLoadingMore] = useState(false)
     const [loading, setLoading] = useState(true)
     const [error, setError] = useState(null)
     const navigate = useNavigate()
@@ -216,6 +218,7 @@ const FeedPage = () => {
             setLoading(true)
             const response = await feedAPI.getFeed()
             setPosts(response.data.results || [])
+            setNextUrl(response.data.next || null)
         } catch (err) {
             setError('Failed to load feed')
             console.error('Error fetching feed:', err)
@@ -224,6 +227,20 @@ const FeedPage = () => {
         }
     }
 
+    const fetchMore = async () => {
+        if (!nextUrl || loadingMore) return
+        try {
+            setLoadingMore(true)
+            const response = await feedAPI.getFeed(nextUrl)
+            setPosts(prev => [...prev, ...(response.data.results || [])])
+            setNextUrl(response.data.next || null)
+        } catch (err) {
+            console.error('Error fetching more posts:', err)
+        } finally {
+            setLoadingMore(false)
+        }
+    }
+
     const handlePostUpdate = (postId, updates) => {
         setPosts(prev => prev.map(post =>
             post.id === postId ? { ...post, ...updates } : post
@@ -376,7 +393,7 @@ const FeedPage = () => {
                 )}
 
                 {/* Load more button */}
-                {!loading && !error && posts.length > 0 && (
+                {!loading && !error && nextUrl && (
                     <motion.div 
                         className="text-center mt-12"
                         initial={{ opacity: 0 }}
@@ -384,11 +401,12 @@ const FeedPage = () => {
                         transition={{ delay: posts.length * 0.1 + 0.5 }}
                     >
                         <button
-                            onClick={fetchFeed}
+                            onClick={fetchMore}
+                            disabled={loadingMore}
                             className="flex items-center space-x-3 px-8 py-3 bg-white text-gray-700 rounded-2xl font-semibold border border-gray-200 hover:bg-gray-50 hover:shadow-lg hover:scale-[1.02] transition-all duration-200 mx-auto"
                         >
                             <Heart className="h-5 w-5 text-pink-500" />
-                            <span>Load more posts</span>
+                            <span>{loadingMore ? 'Loading...' : 'Load more posts'}</span>
                         </button>
                     </motion.div>
                 )}
@@ -14,6 +14,8 @@ const MessagesPage = () => {
     const [requests, setRequests] = useState([])
     const [selectedThread, setSelectedThread] = useState(null)
     const [messages, setMessages] = useState([])
+    const [olderMessagesUrl, setOlderMessagesUrl] = useState(null)
+    const [loadingOlder, setLoadingOlder] = useState(false)
     const [messageText, setMessageText] = useState('')
     const [loading, setLoading] = useState(true)
     const [searchQuery, setSearchQuery] = useState('')
@@ -131,6 +133,7 @@ const MessagesPage = () => {
 
     const fetchMessages = async (id) => {
         console.log('[DEBUG] fetchMessages called with id:', id)
+        setOlderMessagesUrl(null)
         try {
             console.log('[DEBUG] Making API call to getMessages...')
             const response = await messagesAPI.getMessages(id)
@@ -182,7 +185,9 @@ const MessagesPage = () => {
                 }
             } else {
                 console.log('[DEBUG] No flag response, setting messages normally')
-                setMessages(response.data)
+                // Pages come newest first; show them oldest first
+                setMessages([...(response.data.results || [])].reverse())
+                setOlderMessagesUrl(response.data.next || null)
             }
         } catch (error) {
             console.error('[DEBUG] Error fetching messages:', error)
@@ -190,6 +195,20 @@ const MessagesPage = () => {
         }
     }
 
+    const fetchOlderMessages = async () => {
+        if (!olderMessagesUrl || loadingOlder) return
+        try {
+            setLoadingOlder(true)
+            const response = await messagesAPI.getMessages(selectedThread?.id, olderMessagesUrl)
+            setMessages(prev => [...[...(response.data.results || [])].reverse(), ...prev])
+            setOlderMessagesUrl(response.data.next || null)
+        } catch (error) {
+            console.error('Error fetching older messages:', error)
+        } finally {
+            setLoadingOlder(false)
+        }
+    }
+
     const connectWebSocket = (id) => {
         if (socket.current) {
             socket.current.close()
@@ -275,10 +294,10 @@ const MessagesPage = () => {
             // Then send the message using the WebSocket or API
             if (threadResponse.data.created) {
                 // New thread created, send message via API
-                await messagesAPI.sendMessage(threadId, messageText.trim())
+                await messagesAPI.createMessage(threadId, messageText.trim())
             } else {
                 // Existing thread, we could use WebSocket but API is more reliable here
-                await messagesAPI.sendMessage(threadId, messageText.trim())
+                await messagesAPI.createMessage(threadId, messageText.trim())
             }
 
             // Clear search and navigate to the conversation
@@ -449,6 +468,13 @@ const MessagesPage = () => {
                         <h2 className="font-medium text-gray-900">{selectedThread.other_participant?.username}</h2>
                     </div>
                     <div className="flex-1 overflow-y-auto p-4 space-y-4">
+                        {olderMessagesUrl && (
+                            <div className="text-center">
+                                <button onClick={fetchOlderMessages} disabled={loadingOlder} className="text-sm text-pink-500 hover:text-pink-600 disabled:opacity-50">
+                                    {loadingOlder ? 'Loading...' : 'Load earlier messages'}
+                                </button>
+                            </div>
+                        )}
                         {messages.map((message) => (
                             <div key={message.id} className={`flex ${message.sender.username === selectedThread.other_participant?.username ? 'justify-start' : 'justify-end'}`}>
                                 <div className={`max-w-xs lg:max-w-md px-4 py-2 rounded-lg ${message.sender.username !== selectedThread.other_participant?.username ? 'bg-pink-500 text-white' : 'bg-gray-200 text-gray-900'}`}>